@@ -0,0 +1,622 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import AsyncIterator, Optional
+from urllib.parse import urljoin
+
+import asyncio
+import logging
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from almonaut.decoding import get_json_backend
+from almonaut.session import DEFAULT_HEADERS
+from almonaut.exceptions import handle_error_response
+from almonaut.pagination import MAX_PAGE_SIZE, check_page_size
+
+from almonaut.acquisitions import acquisitions_models
+from almonaut.electronic_resources import electronic_resources_models
+
+
+class AsyncAlmaApiClient(object):
+    """The asyncio Alma API client.
+
+    Mirrors :class:`almonaut.client.AlmaApiClient`, but every getter is a
+    coroutine and every ``iter_*`` method is an async iterator. Requires the
+    optional ``httpx`` dependency (``pip install almonaut[async]``).
+
+    :param api_key: The Alma API key to use.
+    :param host: Hostname of the Alma API instance.
+    :param url_prefix: Prefix before the API version.
+    :param version: API version to use.
+    :param concurrency: Maximum number of requests this client keeps in
+        flight at the same time.
+    :param page_size: Number of records requested per page when retrieving
+        all records for a query (at most 100).
+    :param json_backend: JSON library used to decode responses: ``orjson``,
+        ``ujson`` or ``json``. Defaults to the fastest one installed.
+    :param connect_timeout: Seconds to wait for a connection to the Alma
+        host, or None to wait indefinitely.
+    :param read_timeout: Seconds to wait between bytes of a response, or
+        None to wait indefinitely.
+    """
+
+    def __init__(self,
+                 api_key: str,
+                 host: str = 'https://api-ca.hosted.exlibrisgroup.com',
+                 url_prefix: str = 'almaws',
+                 version: str = 'v1',
+                 concurrency: int = 10,
+                 page_size: int = MAX_PAGE_SIZE,
+                 json_backend: Optional[str] = None,
+                 connect_timeout: Optional[float] = 10.0,
+                 read_timeout: Optional[float] = 60.0):
+        """Instantiate a new asyncio API client."""
+        if httpx is None:
+            raise ImportError("AsyncAlmaApiClient requires httpx; "
+                              "install it with 'pip install almonaut[async]'")
+        self.api_key = api_key
+        self.host = host
+        self.url_prefix = url_prefix
+        self.version = version
+        self.concurrency = concurrency
+        self.page_size = check_page_size(page_size)
+        self.json_backend = get_json_backend(json_backend)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.session = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(connect=connect_timeout, read=read_timeout,
+                                  write=None, pool=None),
+            limits=httpx.Limits(max_connections=concurrency,
+                                max_keepalive_connections=concurrency),
+        )
+        self._semaphore = None
+
+    async def __aenter__(self):
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the session on leaving the async context manager."""
+        await self.close()
+
+    async def close(self):
+        """Close the underlying HTTP session."""
+        await self.session.aclose()
+
+    async def _request(self, end_point, format_='json', extra_params=None,
+                       limit=5, offset=0):
+        """Execute an API request."""
+        if self._semaphore is None:
+            # Created lazily so that it binds to the running event loop.
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        rel_url = "/".join((self.url_prefix, self.version, end_point))
+        target_url = urljoin(self.host, rel_url)
+        params = {'apikey': self.api_key, 'format': format_,
+                  'limit': limit, 'offset': offset}
+        params = {**params, **(extra_params or {})}
+        async with self._semaphore:
+            response = await self.session.request('GET', target_url,
+                                                  params=params)
+        logging.info("************* API hit ***************")
+        logging.debug(response.url)
+        if response.status_code >= 400:
+            handle_error_response(response)
+        else:
+            return response
+
+    async def _get_records(self, end_point=None, format_='json',
+                           limit=5, all_records=False, extra_params=None,
+                           data_dict_key=None):
+        """Retrieve records for a query.
+
+        If ``all_records`` is set, the remaining pages are requested together
+        once the first page has reported the total number of records, and
+        merged back in offset order.
+        """
+        if all_records:
+            limit = self.page_size
+        response = await self._request(end_point, format_, extra_params,
+                                       limit=limit, offset=0)
+        response_json = self.json_backend.loads(response.content)
+        total_records = response_json.get('total_record_count', 1)
+
+        if total_records == 0:
+            return
+        elif not all_records:
+            return response_json
+        else:
+            offsets = range(limit, total_records, self.page_size)
+            responses = await asyncio.gather(*(
+                self._request(end_point, format_, extra_params,
+                              limit=self.page_size, offset=offset)
+                for offset in offsets
+            ))
+            for subsequent_response in responses:
+                response_json[data_dict_key] += self.json_backend.loads(subsequent_response.content)[data_dict_key]
+            return response_json
+
+    async def _iter_records(self, end_point=None, format_='json',
+                            extra_params=None, data_dict_key=None):
+        """Yield the records for a query one page at a time."""
+        limit = self.page_size
+        offset = 0
+        while True:
+            response = await self._request(end_point, format_, extra_params,
+                                           limit=limit, offset=offset)
+            page = self.json_backend.loads(response.content)
+            # Some endpoints (e.g. e-services) can report a null total.
+            total_records = page.get('total_record_count')
+            records = page.get(data_dict_key) or []
+            del page
+            if not records:
+                return
+            offset += len(records)
+            for record in records:
+                yield record
+            if total_records is None:
+                if len(records) < limit:
+                    return
+            elif offset >= total_records:
+                return
+
+    # API methods
+
+    # acquisitions
+
+    async def get_fund(self, id_: str, format_: str = 'json') -> acquisitions_models.Fund:
+        r"""Get a fund record.
+
+        :param id\_: Alma fund ID.
+        :param format\_: Format of the raw returned data.
+        """
+        result = await self._get_records(end_point=f"acq/funds/{id_}",
+                                         format_=format_,
+                                         limit=1,
+                                         extra_params={'view': 'full'}
+                                         )
+        if result:
+            return acquisitions_models.Fund.parse_obj(result)
+
+    async def get_funds(self, format_: str = 'json', limit: int = 5,
+                        all_records: bool = False, extra_params={}) -> acquisitions_models.Funds:
+        r"""Get fund records.
+
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        result = await self._get_records(end_point='acq/funds',
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params={**extra_params, 'view': 'full'},
+                                         data_dict_key='fund'
+                                         )
+        if result:
+            return acquisitions_models.Funds.parse_obj(result)
+
+    async def iter_funds(self, format_: str = 'json',
+                         extra_params={}) -> AsyncIterator[acquisitions_models.Fund]:
+        r"""Iterate over fund records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        async for record in self._iter_records(end_point='acq/funds',
+                                               format_=format_,
+                                               extra_params={**extra_params, 'view': 'full'},
+                                               data_dict_key='fund'
+                                               ):
+            yield acquisitions_models.Fund.parse_obj(record)
+
+    async def get_fund_transactions(self, fund_id: str, format_: str = 'json',
+                                    limit: int = 5, all_records: bool = False,
+                                    extra_params={}) -> acquisitions_models.FundTransactions:
+        r"""Get fund transaction records.
+
+        :param fund_id: Alma fund ID.
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        result = await self._get_records(end_point=f"acq/funds/{fund_id}/transactions",
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params=extra_params,
+                                         data_dict_key='fund_transaction'
+                                         )
+        if result:
+            return acquisitions_models.FundTransactions.parse_obj(result)
+
+    async def iter_fund_transactions(self, fund_id: str, format_: str = 'json',
+                                     extra_params={}) -> AsyncIterator[acquisitions_models.FundTransaction]:
+        r"""Iterate over fund transaction records page by page.
+
+        :param fund_id: Alma fund ID.
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        async for record in self._iter_records(end_point=f"acq/funds/{fund_id}/transactions",
+                                               format_=format_,
+                                               extra_params=extra_params,
+                                               data_dict_key='fund_transaction'
+                                               ):
+            yield acquisitions_models.FundTransaction.parse_obj(record)
+
+    async def get_invoice(self, invoice_id: str, format_: str = 'json') -> acquisitions_models.Invoice:
+        r"""Get an invoice record.
+
+        :param invoice_id: Alma invoice ID.
+        :param format\_: Format of the raw returned data.
+        """
+        result = await self._get_records(end_point=f"acq/invoices/{invoice_id}",
+                                         format_=format_,
+                                         limit=1,
+                                         extra_params={}
+                                         )
+        if result:
+            return acquisitions_models.Invoice.parse_obj(result)
+
+    async def get_invoices(self, format_: str = 'json', limit: int = 5,
+                           all_records: bool = False, extra_params={}) -> acquisitions_models.Invoices:
+        r"""Get invoice records.
+
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        result = await self._get_records(end_point='acq/invoices/',
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params=extra_params,
+                                         data_dict_key='invoice'
+                                         )
+        if result:
+            return acquisitions_models.Invoices.parse_obj(result)
+
+    async def iter_invoices(self, format_: str = 'json',
+                            extra_params={}) -> AsyncIterator[acquisitions_models.Invoice]:
+        r"""Iterate over invoice records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        async for record in self._iter_records(end_point='acq/invoices/',
+                                               format_=format_,
+                                               extra_params=extra_params,
+                                               data_dict_key='invoice'
+                                               ):
+            yield acquisitions_models.Invoice.parse_obj(record)
+
+    async def get_invoice_line(self, invoice_id: str, invoice_line_id: str,
+                               format_: str = 'json') -> acquisitions_models.InvoiceLine:
+        r"""Get an invoice line record.
+
+        :param invoice_id: Alma invoice ID.
+        :param invoice_line_id: Alma invoice line ID.
+        :param format\_: Format of the raw returned data.
+        """
+        result = await self._get_records(end_point=f"acq/invoices/{invoice_id}/lines/{invoice_line_id}",
+                                         format_=format_,
+                                         limit=1,
+                                         extra_params={}
+                                         )
+        if result:
+            return acquisitions_models.InvoiceLine.parse_obj(result)
+
+    async def get_invoice_lines(self, invoice_id: str, format_: str = 'json',
+                                limit: int = 5, all_records: bool = False,
+                                extra_params={}) -> acquisitions_models.InvoiceLines:
+        r"""Get invoice line records.
+
+        :param invoice_id: Alma invoice ID.
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        result = await self._get_records(end_point=f"acq/invoices/{invoice_id}/lines",
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params=extra_params,
+                                         data_dict_key='invoice_line'
+                                         )
+        if result:
+            return acquisitions_models.InvoiceLines.parse_obj(result)
+
+    async def iter_invoice_lines(self, invoice_id: str, format_: str = 'json',
+                                 extra_params={}) -> AsyncIterator[acquisitions_models.InvoiceLine]:
+        r"""Iterate over invoice line records page by page.
+
+        :param invoice_id: Alma invoice ID.
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        async for record in self._iter_records(end_point=f"acq/invoices/{invoice_id}/lines",
+                                               format_=format_,
+                                               extra_params=extra_params,
+                                               data_dict_key='invoice_line'
+                                               ):
+            yield acquisitions_models.InvoiceLine.parse_obj(record)
+
+    async def get_license(self, code: str, format_: str = 'json') -> acquisitions_models.License:
+        r"""Get a license record.
+
+        :param code: Alma license code.
+        :param format\_: Format of the raw returned data.
+        """
+        result = await self._get_records(end_point=f"acq/licenses/{code}",
+                                         format_=format_,
+                                         limit=1,
+                                         extra_params={}
+                                         )
+        if result:
+            return acquisitions_models.License.parse_obj(result)
+
+    async def get_licenses(self, format_: str = 'json', limit: int = 5,
+                           all_records: bool = False, extra_params={}) -> acquisitions_models.Licenses:
+        r"""Get license records.
+
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        result = await self._get_records(end_point='acq/licenses',
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params=extra_params,
+                                         data_dict_key='license'
+                                         )
+        if result:
+            return acquisitions_models.Licenses.parse_obj(result)
+
+    async def iter_licenses(self, format_: str = 'json',
+                            extra_params={}) -> AsyncIterator[acquisitions_models.License]:
+        r"""Iterate over license records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        async for record in self._iter_records(end_point='acq/licenses',
+                                               format_=format_,
+                                               extra_params=extra_params,
+                                               data_dict_key='license'
+                                               ):
+            yield acquisitions_models.License.parse_obj(record)
+
+    async def get_po_line(self, number: str, format_: str = 'json') -> acquisitions_models.PoLine:
+        r"""Get a PO Line record.
+
+        :param number: Alma PO Line number.
+        :param format\_: Format of the raw returned data.
+        """
+        result = await self._get_records(end_point=f"acq/po-lines/{number}",
+                                         format_=format_,
+                                         limit=1,
+                                         extra_params={}
+                                         )
+        if result:
+            return acquisitions_models.PoLine.parse_obj(result)
+
+    async def get_po_lines(self, format_: str = 'json', limit: int = 5,
+                           all_records: bool = False, extra_params={}) -> acquisitions_models.PoLines:
+        r"""Get PO Line records.
+
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        result = await self._get_records(end_point='acq/po-lines',
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params=extra_params,
+                                         data_dict_key='po_line'
+                                         )
+        if result:
+            return acquisitions_models.PoLines.parse_obj(result)
+
+    async def iter_po_lines(self, format_: str = 'json',
+                            extra_params={}) -> AsyncIterator[acquisitions_models.PoLine]:
+        r"""Iterate over PO Line records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        async for record in self._iter_records(end_point='acq/po-lines',
+                                               format_=format_,
+                                               extra_params=extra_params,
+                                               data_dict_key='po_line'
+                                               ):
+            yield acquisitions_models.PoLine.parse_obj(record)
+
+    # e-resources
+
+    async def get_electronic_collection(self, collection_id: str,
+                                        format_: str = 'json') -> electronic_resources_models.ElectronicCollection:
+        r"""Get an Electronic Collection record.
+
+        :param collection_id: Alma electronic collection ID.
+        :param format\_: Format of the raw returned data.
+        """
+        result = await self._get_records(end_point=f"electronic/e-collections/{collection_id}",
+                                         format_=format_,
+                                         limit=1,
+                                         extra_params={}
+                                         )
+        if result:
+            return electronic_resources_models.ElectronicCollection.parse_obj(result)
+
+    async def get_electronic_collections(self, format_: str = 'json', limit: int = 5,
+                                         all_records: bool = False,
+                                         extra_params={}) -> electronic_resources_models.ElectronicCollections:
+        r"""Get Electronic Collection records.
+
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        result = await self._get_records(end_point='electronic/e-collections',
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params=extra_params,
+                                         data_dict_key='electronic_collection'
+                                         )
+        if result:
+            return electronic_resources_models.ElectronicCollections.parse_obj(result)
+
+    async def iter_electronic_collections(self, format_: str = 'json',
+                                          extra_params={}) -> AsyncIterator[electronic_resources_models.ElectronicCollection]:
+        r"""Iterate over Electronic Collection records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        async for record in self._iter_records(end_point='electronic/e-collections',
+                                               format_=format_,
+                                               extra_params=extra_params,
+                                               data_dict_key='electronic_collection'
+                                               ):
+            yield electronic_resources_models.ElectronicCollection.parse_obj(record)
+
+    async def get_electronic_service(self, collection_id: str, service_id: str,
+                                     format_: str = 'json') -> electronic_resources_models.ElectronicService:
+        r"""Get an Electronic Service record.
+
+        :param collection_id: Alma electronic collection ID.
+        :param service_id: Alma electronic service ID.
+        :param format\_: Format of the raw returned data.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}"
+        result = await self._get_records(end_point=end_point,
+                                         format_=format_,
+                                         limit=1,
+                                         extra_params={}
+                                         )
+        if result:
+            return electronic_resources_models.ElectronicService.parse_obj(result)
+
+    async def get_electronic_services(self, collection_id: str,
+                                      format_: str = 'json', limit: int = 5,
+                                      all_records: bool = False,
+                                      extra_params={}) -> electronic_resources_models.ElectronicServices:
+        r"""Get Electronic Service records.
+
+        :param collection_id: Alma electronic collection ID.
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services"
+        result = await self._get_records(end_point=end_point,
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params=extra_params,
+                                         data_dict_key='electronic_service'
+                                         )
+        if result:
+            return electronic_resources_models.ElectronicServices.parse_obj(result)
+
+    async def iter_electronic_services(self, collection_id: str, format_: str = 'json',
+                                       extra_params={}) -> AsyncIterator[electronic_resources_models.ElectronicService]:
+        r"""Iterate over Electronic Service records page by page.
+
+        :param collection_id: Alma electronic collection ID.
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services"
+        async for record in self._iter_records(end_point=end_point,
+                                               format_=format_,
+                                               extra_params=extra_params,
+                                               data_dict_key='electronic_service'
+                                               ):
+            yield electronic_resources_models.ElectronicService.parse_obj(record)
+
+    async def get_portfolio(self, collection_id: str, service_id: str,
+                            portfolio_id: str, format_: str = 'json') -> electronic_resources_models.Portfolio:
+        r"""Get a Portfolio record.
+
+        :param collection_id: Alma electronic collection ID.
+        :param service_id: Alma electronic service ID.
+        :param portfolio_id: Alma portfolio ID.
+        :param format\_: Format of the raw returned data.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}/portfolios/{portfolio_id}"
+        result = await self._get_records(end_point=end_point,
+                                         format_=format_,
+                                         limit=1,
+                                         extra_params={}
+                                         )
+        if result:
+            return electronic_resources_models.Portfolio.parse_obj(result)
+
+    async def get_portfolios(self, collection_id: str, service_id: str,
+                             format_: str = 'json', limit: int = 5,
+                             all_records: bool = False, extra_params={}) -> electronic_resources_models.Portfolios:
+        r"""Get Portfolio records.
+
+        :param collection_id: Alma electronic collection ID.
+        :param service_id: Alma electronic service ID.
+        :param format\_: Format of the raw returned data.
+        :param limit: The maximum number of records to be returned.
+        :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
+        :param extra_params: Additional parameters.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}/portfolios"
+        result = await self._get_records(end_point=end_point,
+                                         format_=format_,
+                                         limit=limit,
+                                         all_records=all_records,
+                                         extra_params=extra_params,
+                                         data_dict_key='portfolio'
+                                         )
+        if result:
+            return electronic_resources_models.Portfolios.parse_obj(result)
+
+    async def iter_portfolios(self, collection_id: str, service_id: str,
+                              format_: str = 'json',
+                              extra_params={}) -> AsyncIterator[electronic_resources_models.Portfolio]:
+        r"""Iterate over Portfolio records page by page.
+
+        :param collection_id: Alma electronic collection ID.
+        :param service_id: Alma electronic service ID.
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}/portfolios"
+        async for record in self._iter_records(end_point=end_point,
+                                               format_=format_,
+                                               extra_params=extra_params,
+                                               data_dict_key='portfolio'
+                                               ):
+            yield electronic_resources_models.Portfolio.parse_obj(record)
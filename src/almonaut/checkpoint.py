@@ -0,0 +1,96 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+import json
+import os
+
+
+class HarvestCheckpoint(object):
+    """Progress of a resumable harvest, persisted to a local JSON file.
+
+    The checkpoint is rewritten after every page has been appended to the
+    output file, so an interrupted harvest can resume from the first page
+    that was not completely written.
+
+    :param path: Location of the checkpoint file.
+    :param end_point: The API endpoint being harvested.
+    :param extra_params: The query parameters of the harvest.
+    :param output_path: Location of the JSON Lines output file.
+    :param next_offset: Offset of the next page to request.
+    :param records_written: Number of records written to the output file.
+    :param output_bytes: Size of the output file after the last complete page.
+    :param total_record_count: Total number of records reported by Alma.
+    """
+
+    def __init__(self,
+                 path: str,
+                 end_point: str,
+                 extra_params: dict,
+                 output_path: str,
+                 next_offset: int = 0,
+                 records_written: int = 0,
+                 output_bytes: int = 0,
+                 total_record_count: Optional[int] = None):
+        """Init method."""
+        self.path = path
+        self.end_point = end_point
+        self.extra_params = extra_params
+        self.output_path = output_path
+        self.next_offset = next_offset
+        self.records_written = records_written
+        self.output_bytes = output_bytes
+        self.total_record_count = total_record_count
+
+    @classmethod
+    def load(cls, path: str) -> Optional['HarvestCheckpoint']:
+        """Load a checkpoint file, or return None if it does not exist."""
+        try:
+            with open(path, encoding='utf-8') as checkpoint_file:
+                state = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+        return cls(path=path, **state)
+
+    def matches(self, end_point: str, extra_params: dict, output_path: str) -> bool:
+        """Whether this checkpoint was recorded for the given harvest."""
+        return (self.end_point == end_point
+                and self.extra_params == extra_params
+                and os.path.abspath(self.output_path) == os.path.abspath(output_path))
+
+    def save(self):
+        """Atomically write the checkpoint file."""
+        state = {
+            'end_point': self.end_point,
+            'extra_params': self.extra_params,
+            'output_path': self.output_path,
+            'next_offset': self.next_offset,
+            'records_written': self.records_written,
+            'output_bytes': self.output_bytes,
+            'total_record_count': self.total_record_count,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump(state, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        """Delete the checkpoint file once the harvest has completed."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
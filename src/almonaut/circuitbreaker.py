@@ -0,0 +1,95 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+
+from almonaut.exceptions import CircuitOpenError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker(object):
+    """Fail fast while the Alma host is erroring or unreachable.
+
+    The breaker starts closed. After ``failure_threshold`` consecutive
+    failures (connection errors, timeouts and 5xx responses) it opens, and
+    every request fails immediately with a
+    :class:`~almonaut.exceptions.CircuitOpenError`. Once ``recovery_timeout``
+    seconds have passed it lets up to ``half_open_max_calls`` probe requests
+    through: a successful probe closes the breaker again, a failed one
+    re-opens it for another ``recovery_timeout``.
+
+    :param failure_threshold: Consecutive failures which open the breaker.
+    :param recovery_timeout: Seconds to stay open before probing the host.
+    :param half_open_max_calls: Number of concurrent probe requests allowed.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        """Init method."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Admit a request, or raise CircuitOpenError if the breaker is open."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    raise CircuitOpenError(data={'retry_in': self._retry_in()})
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    raise CircuitOpenError(data={'retry_in': 0})
+                self._probes += 1
+
+    def record_success(self):
+        """Record a request which reached a healthy host."""
+        with self._lock:
+            if self.state != CLOSED:
+                logging.info("Alma API circuit breaker closed")
+            self.state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        """Record a failed request, opening the breaker if needed."""
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logging.warning("Alma API circuit breaker opened after "
+                                    f"{self._failures} failures")
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Give back a half-open probe slot without recording an outcome."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def _retry_in(self):
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
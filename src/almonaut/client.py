@@ -12,13 +12,38 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import (Callable, Dict, Hashable, Iterable, Iterator, Mapping,
+                    NamedTuple, Optional, Tuple, Union)
 from urllib.parse import urljoin
 
-import json
+import copy
 import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE
 
 from almonaut.session import AlmaApiSession
-from almonaut.exceptions import handle_error_response
+from almonaut import decoding
+from almonaut.checkpoint import HarvestCheckpoint
+from almonaut.circuitbreaker import CircuitBreaker
+from almonaut.exceptions import DeadlineExceededError, handle_error_response
+from almonaut.keys import ApiKeyPool
+from almonaut.lazy import lazy_model
+from almonaut.pagination import (AdaptivePageSize, MAX_PAGE_SIZE,
+                                 MIN_PAGE_SIZE, check_page_size)
+from almonaut.parsing import validate_records
+from almonaut.projection import get_projection
+from almonaut.quota import ApiQuota
+from almonaut.ratelimit import TokenBucket
+from almonaut.retry import RetryPolicy
+from almonaut.singleflight import SingleFlight
+from almonaut.trusted import TrustedParser, construct_model
 
 from almonaut.acquisitions import acquisitions_models
 from almonaut.electronic_resources import electronic_resources_models
@@ -26,92 +51,775 @@ from almonaut.electronic_resources import electronic_resources_models
 logging.basicConfig(level=logging.DEBUG)
 # logging.basicConfig(level=logging.WARNING)
 
+# Failures which may succeed on another attempt: no response, or a response
+# whose body stalled or was cut off.
+_TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout,
+                     requests.exceptions.ChunkedEncodingError)
+
+
+def _bounded_map(executor, fn, items, window):
+    """Yield ``(item, fn(item))`` in input order, running up to window calls.
+
+    Unlike ``Executor.map``, items are only pulled from the iterable as
+    earlier calls complete, so arbitrarily long inputs can be streamed.
+    """
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= window:
+            done_item, future = pending.popleft()
+            yield done_item, future.result()
+    while pending:
+        done_item, future = pending.popleft()
+        yield done_item, future.result()
+
+
+class BatchResult(NamedTuple):
+    """The outcome of a batch lookup by ID.
+
+    :param records: The retrieved records, keyed by ID.
+    :param errors: The exception raised for each ID which could not be
+        retrieved, keyed by ID.
+    """
+
+    records: Dict[Hashable, object]
+    errors: Dict[Hashable, Exception]
+
+
+class RequestContext(NamedTuple):
+    """The immutable per-call state shared by every page of a query.
+
+    Keeping this out of the client instance means one client, and its pooled
+    session, can serve calls from many threads at once. ``deadline`` is the
+    ``time.monotonic()`` value by which every page of the call, retries
+    included, must have completed.
+    """
+
+    end_point: str
+    format_: str = 'json'
+    extra_params: Mapping = MappingProxyType({})
+    method: str = 'GET'
+    bulk: bool = False
+    deadline: Optional[float] = None
+
+    @classmethod
+    def create(cls, end_point, format_='json', extra_params=None, method='GET',
+               bulk=False, deadline=None):
+        """Create a context holding a read-only copy of extra_params.
+
+        ``deadline`` is given in seconds from now.
+        """
+        return cls(end_point=end_point,
+                   format_=format_,
+                   extra_params=MappingProxyType(dict(extra_params or {})),
+                   method=method,
+                   bulk=bulk,
+                   deadline=None if deadline is None else time.monotonic() + deadline)
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left before the deadline, if there is one."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
 
 class AlmaApiClient(object):
     """The Alma API client.
 
-    :param api_key: The Alma API key to use.
+    :param api_key: The Alma API key to use, or an
+        :class:`~almonaut.keys.ApiKeyPool` of keys to choose from per
+        endpoint family.
     :param host: Hostname of the Alma API instance.
     :param url_prefix: Prefix before the API version.
     :param version: API version to use.
+    :param concurrency: Maximum number of page requests to run in parallel
+        when retrieving all records for a query.
+    :param page_size: Number of records requested per page when retrieving
+        all records for a query (at most 100).
+    :param adaptive_page_size: Whether sequential harvests should shrink and
+        grow the page size (up to ``page_size``) based on the observed
+        latency and payload size of each page.
+    :param validation_processes: Number of worker processes used to validate
+        the records of multi-page results. With the default of 0, records
+        are validated in the calling thread.
+    :param retry_policy: When and how to retry failed GET requests; pass
+        ``None`` to send each request only once.
+    :param rate_limiter: A :class:`~almonaut.ratelimit.TokenBucket` (or
+        :class:`~almonaut.ratelimit.FileTokenBucket`) which every request,
+        including retries, must take a token from before being sent.
+    :param quota_reserve: Number of daily API calls to keep back for
+        interactive use. Once Alma reports fewer remaining, paginated
+        harvests wait ``quota_delay`` seconds before each request.
+    :param quota_delay: Seconds to wait before each harvest request while
+        below the reserve, or None to stop the harvest with a
+        :class:`~almonaut.exceptions.QuotaReserveError`.
+    :param pool_maxsize: Maximum number of connections kept open to the
+        Alma host (defaults to enough for ``concurrency``).
+    :param pool_block: Whether requests should wait for a free pooled
+        connection rather than open a throwaway one when the pool is full.
+    :param tcp_keepalive: Whether to enable TCP keep-alive on pooled
+        connections.
+    :param stream_responses: Whether to decode response bodies incrementally
+        as they arrive instead of reading them fully into memory first.
+        Requires the optional ``ijson`` dependency
+        (``pip install almonaut[streaming]``).
+    :param coalesce_requests: Whether concurrent identical single-page
+        requests (same endpoint and parameters) should share one HTTP call.
+        Each caller receives its own copy of the decoded result.
+    :param circuit_breaker: A :class:`~almonaut.circuitbreaker.CircuitBreaker`
+        which makes requests fail fast with a
+        :class:`~almonaut.exceptions.CircuitOpenError` while the host is
+        failing.
+    :param connect_timeout: Seconds to wait for a connection to the Alma
+        host, or None to wait indefinitely.
+    :param read_timeout: Seconds to wait between bytes of a response, or
+        None to wait indefinitely.
+    :param deadline: Default overall time budget in seconds of each getter
+        call, covering all of its pages and retries. Once it has passed, the
+        call raises a :class:`~almonaut.exceptions.DeadlineExceededError`.
+        ``iter_*`` iterators and harvests are not bound by it.
+    :param json_backend: JSON library used to decode responses and write
+        harvests: ``orjson``, ``ujson`` or ``json``. Defaults to the fastest
+        one installed.
+    :param raw: Whether getters and iterators should return the decoded
+        response dicts instead of validated models, *e.g.* for jobs which
+        only forward records elsewhere. Can be overridden per call.
+    :param trusted_construction: Whether to build models without full
+        validation, trusting Alma's payloads to match them (see
+        :class:`~almonaut.trusted.TrustedParser`). Records are then built in
+        the calling thread, without ``validation_processes``.
+    :param validation_sample_rate: With ``trusted_construction``, the
+        fraction of records which is still fully validated to detect schema
+        drift.
+    :param lazy_validation: Whether to return lazily validated models (see
+        :func:`~almonaut.lazy.lazy_model`), whose nested models and lists are
+        only validated when first accessed. Records are then parsed in the
+        calling thread, without ``validation_processes``.
     """
 
     def __init__(self,
-                 api_key: str,
+                 api_key: Union[str, ApiKeyPool],
                  host: str = 'https://api-ca.hosted.exlibrisgroup.com',
                  url_prefix: str = 'almaws',
-                 version: str = 'v1'):
+                 version: str = 'v1',
+                 concurrency: int = 1,
+                 page_size: int = MAX_PAGE_SIZE,
+                 adaptive_page_size: bool = False,
+                 validation_processes: int = 0,
+                 retry_policy: Optional[RetryPolicy] = RetryPolicy(),
+                 rate_limiter: Optional[TokenBucket] = None,
+                 quota_reserve: Optional[int] = None,
+                 quota_delay: Optional[float] = 1.0,
+                 pool_maxsize: Optional[int] = None,
+                 pool_block: bool = False,
+                 tcp_keepalive: bool = True,
+                 stream_responses: bool = False,
+                 coalesce_requests: bool = False,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 connect_timeout: Optional[float] = 10.0,
+                 read_timeout: Optional[float] = 60.0,
+                 deadline: Optional[float] = None,
+                 json_backend: Optional[str] = None,
+                 raw: bool = False,
+                 trusted_construction: bool = False,
+                 validation_sample_rate: float = 0.01,
+                 lazy_validation: bool = False):
         """Instantiate a new API client."""
         self.api_key = api_key
         self.host = host
         self.url_prefix = url_prefix
         self.version = version
-        self.session = AlmaApiSession()
+        self.concurrency = concurrency
+        self.page_size = check_page_size(page_size)
+        self.adaptive_page_size = adaptive_page_size
+        self.validation_processes = validation_processes
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.quota = ApiQuota(reserve=quota_reserve, delay=quota_delay)
+        if stream_responses and decoding.ijson is None:
+            raise ImportError("stream_responses requires ijson; install it "
+                              "with 'pip install almonaut[streaming]'")
+        self.stream_responses = stream_responses
+        self._single_flight = SingleFlight() if coalesce_requests else None
+        self.circuit_breaker = circuit_breaker
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.json_backend = decoding.get_json_backend(json_backend)
+        self.raw = raw
+        if trusted_construction and lazy_validation:
+            raise ValueError("trusted_construction and lazy_validation "
+                             "cannot be combined")
+        self.trusted_parser = (TrustedParser(sample_rate=validation_sample_rate)
+                               if trusted_construction else None)
+        self.lazy_validation = lazy_validation
+        if pool_maxsize is None:
+            # walk_electronic_resources runs two levels of `concurrency`
+            # requests at once.
+            pool_maxsize = max(DEFAULT_POOLSIZE, 2 * concurrency)
+        self.session = AlmaApiSession(pool_maxsize=pool_maxsize,
+                                      pool_block=pool_block,
+                                      tcp_keepalive=tcp_keepalive)
+        self._validation_pool = None
+        self._validation_pool_lock = threading.Lock()
+
+    def __enter__(self):
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Release resources on leaving the context manager."""
+        self.close()
+
+    def close(self):
+        """Close the session and shut down the validation process pool."""
+        with self._validation_pool_lock:
+            if self._validation_pool is not None:
+                self._validation_pool.shutdown()
+                self._validation_pool = None
+        self.session.close()
+
+    @property
+    def schema_drift(self) -> int:
+        """Number of sampled records found not to match their model.
+
+        Always 0 unless ``trusted_construction`` is enabled.
+        """
+        if self.trusted_parser is None:
+            return 0
+        return self.trusted_parser.drift_count
 
-    def _request(self, limit=5, offset=0):
-        """Execute an API request."""
-        rel_url = "/".join((self.url_prefix, self.version, self.end_point))
+    @property
+    def api_remaining(self) -> Optional[int]:
+        """The remaining daily API calls last reported by Alma, if any.
+
+        With an :class:`~almonaut.keys.ApiKeyPool`, this is the budget of
+        the key used last; use the pool's ``remaining()`` method for the
+        budget of each key.
+        """
+        return self.quota.remaining
+
+    def _validation_executor(self):
+        """Return the validation process pool, creating it on first use."""
+        if (not self.validation_processes or self.trusted_parser is not None
+                or self.lazy_validation):
+            return None
+        with self._validation_pool_lock:
+            if self._validation_pool is None:
+                self._validation_pool = ProcessPoolExecutor(
+                    max_workers=self.validation_processes)
+            return self._validation_pool
+
+    def _select_api_key(self, context: RequestContext) -> str:
+        """Return the API key to send with a request."""
+        if isinstance(self.api_key, ApiKeyPool):
+            return self.api_key.select(context.end_point)
+        return self.api_key
+
+    def _request(self, context: RequestContext, limit=5, offset=0,
+                 decode: Optional[Callable] = None):
+        """Execute an API request.
+
+        If given, ``decode`` is applied to a successful response within the
+        same attempt, and its result is returned instead of the response.
+        A streamed body is only read there, so a read which stalls or is cut
+        off is retried, counted by the circuit breaker and bounded by the
+        deadline just like a failure to get the response headers.
+        """
+        rel_url = "/".join((self.url_prefix, self.version, context.end_point))
         target_url = urljoin(self.host, rel_url)
-        params = {'apikey': self.api_key, 'format': self.format_,
-                  'limit': limit, 'offset': offset}
-        params = {**params, **self.extra_params}
-        response = self.session.request(self.method, target_url,
-                                        params=params)
-        logging.info("************* API hit ***************")
-        logging.debug(response.url)
-        if response.status_code >= 400:
-            handle_error_response(response)
-        else:
-            return response
+        params = {'format': context.format_, 'limit': limit, 'offset': offset}
+        params = {**params, **context.extra_params}
+        retry_policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            api_key = self._select_api_key(context)
+            params['apikey'] = api_key
+            if context.bulk:
+                if isinstance(self.api_key, ApiKeyPool):
+                    self.quota.throttle(self.api_key.remaining(api_key))
+                else:
+                    self.quota.throttle()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            timeout = self._timeout(context)
+            breaker = self.circuit_breaker
+            if breaker is not None:
+                breaker.before_request()
+            try:
+                response = self.session.request(context.method, target_url,
+                                                params=params,
+                                                timeout=timeout,
+                                                stream=self.stream_responses)
+                if decode is not None and response.status_code < 400:
+                    decoded = decode(response)
+            except _TRANSIENT_ERRORS as e:
+                remaining = context.remaining()
+                if breaker is not None:
+                    # A failure under timeouts cut short to fit the caller's
+                    # deadline says nothing about the health of the host.
+                    if ((remaining is not None and remaining <= 0)
+                            or timeout != (self.connect_timeout, self.read_timeout)):
+                        breaker.release_probe()
+                    else:
+                        breaker.record_failure()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceededError(data={'end_point': context.end_point}) from e
+                if not (retry_policy and retry_policy.is_retryable(context.method, attempt)):
+                    raise
+                delay = retry_policy.backoff(attempt)
+                if not (retry_policy.within_budget(time.monotonic() - started, delay)
+                        and (remaining is None or delay < remaining)):
+                    raise
+                logging.warning(f"{e!r}; retrying {context.end_point} in {delay:.2f}s")
+            except requests.RequestException:
+                # e.g. an undecodable body from a degraded host
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except BaseException:
+                # Not the host's fault (e.g. KeyboardInterrupt), but a
+                # half-open probe slot must not be leaked.
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+            else:
+                logging.info("************* API hit ***************")
+                logging.debug(response.url)
+                if isinstance(self.api_key, ApiKeyPool):
+                    self.api_key.update(api_key, response)
+                self.quota.update(response)
+                if breaker is not None:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if response.status_code < 400:
+                    return response if decode is None else decoded
+                if not (retry_policy and retry_policy.is_retryable(context.method, attempt, response)):
+                    handle_error_response(response)
+                delay = retry_policy.backoff(attempt, response)
+                remaining = context.remaining()
+                # Never retry sooner than the server's Retry-After.
+                if not (delay is not None
+                        and retry_policy.within_budget(time.monotonic() - started, delay)
+                        and (remaining is None or delay < remaining)):
+                    handle_error_response(response)
+                response.close()
+                logging.warning(f"HTTP {response.status_code}; retrying "
+                                f"{context.end_point} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def _timeout(self, context: RequestContext):
+        """Return the (connect, read) timeout for the next attempt.
+
+        Both timeouts are capped at the time left before the context's
+        deadline.
+
+        :raises DeadlineExceededError: If the deadline has already passed.
+        """
+        remaining = context.remaining()
+        if remaining is None:
+            return self.connect_timeout, self.read_timeout
+        if remaining <= 0:
+            raise DeadlineExceededError(data={'end_point': context.end_point})
+        return tuple(remaining if t is None else min(t, remaining)
+                     for t in (self.connect_timeout, self.read_timeout))
 
     def _get_records(self, end_point=None, format_='json',
                      limit=5, all_records=False, extra_params=None,
-                     data_dict_key=None):
+                     data_dict_key=None, concurrency=None, page_size=None,
+                     deadline=None, projection=None):
         """Retrieve records for a query.
 
         If the number of records for the query exceeds the limit, make multiple
-        API calls until all records for the query are retrieved.
-        """
-        self.end_point = end_point
-        self.format_ = format_
-        self.extra_params = extra_params
-        self.method = 'GET'
-
-        response = self._request(limit=limit, offset=0)
-        if type(json.loads(response.content)) == dict:
-            response_json = json.loads(response.content)
-            if 'total_record_count' in response_json:
-                total_records = response_json['total_record_count']
-            else:
-                total_records = 1
+        API calls until all records for the query are retrieved. Once the
+        total number of records is known, the remaining pages are independent
+        of each other, so up to ``concurrency`` of them are requested in
+        parallel and merged back in offset order.
+
+        Each response body is decoded exactly once; the merged dict is
+        returned as is, ready for a model's ``parse_obj``.
+
+        All pages and their retries share one ``deadline`` (in seconds,
+        defaulting to the client's). With a ``projection``, each page keeps
+        only the projected fields of its records.
+        """
+        if deadline is None:
+            deadline = self.deadline
+        context = RequestContext.create(end_point, format_, extra_params,
+                                        bulk=all_records, deadline=deadline)
+
+        if all_records:
+            page_size = self._resolve_page_size(page_size)
+            limit = page_size
+
+        response_json, _ = self._fetch_page(context, limit=limit, offset=0,
+                                            projection=projection,
+                                            data_dict_key=data_dict_key)
+        total_records = response_json.get('total_record_count', 1)
 
         if total_records == 0:
             return
         elif not all_records:
-            return response.content
+            return response_json
         else:
+            if concurrency is None:
+                concurrency = self.concurrency
             records_requested = limit
-            limit = 50
-            while records_requested < total_records:
-                subsequent_response = self._request(limit=limit,
-                                                    offset=records_requested)
-                records_requested += limit
-                if type(json.loads(subsequent_response.content)) == dict:
-                    subsequent_response_json = json.loads(subsequent_response.content)
-                    response_json[data_dict_key] += subsequent_response_json[data_dict_key]
-            back_to_str = json.dumps(response_json)
-
-            return back_to_str
+
+            if concurrency > 1 and total_records - records_requested > page_size:
+                offsets = range(records_requested, total_records, page_size)
+
+                def fetch_page(offset):
+                    return self._fetch_page(context, limit=page_size, offset=offset,
+                                            projection=projection,
+                                            data_dict_key=data_dict_key)
+
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    subsequent_pages = executor.map(fetch_page, offsets)
+                    for subsequent_page, _ in subsequent_pages:
+                        self._merge_page(response_json, subsequent_page,
+                                         data_dict_key)
+            else:
+                page_sizer = self._page_sizer(page_size)
+                while records_requested < total_records:
+                    started = time.monotonic()
+                    subsequent_page, payload_bytes = self._fetch_page(
+                        context, limit=page_size, offset=records_requested,
+                        projection=projection, data_dict_key=data_dict_key)
+                    records_requested += page_size
+                    self._merge_page(response_json, subsequent_page,
+                                     data_dict_key)
+                    if page_sizer:
+                        page_size = page_sizer.observe(time.monotonic() - started,
+                                                       payload_bytes)
+            return response_json
+
+    def _fetch_page(self, context, limit=5, offset=0, projection=None,
+                    data_dict_key=None):
+        """Request and decode one page, returning it and its body size.
+
+        With ``coalesce_requests``, concurrent identical requests outside of
+        bulk harvests share one call, and each caller gets its own copy of
+        the decoded page, which raw output hands back to the user; bulk
+        harvests are never coalesced.
+
+        With a ``projection``, the records under ``data_dict_key`` are
+        replaced by copies holding only the projected fields as soon as the
+        page is decoded.
+        """
+        def decode(response):
+            return decoding.decode_response(response,
+                                            stream=self.stream_responses,
+                                            backend=self.json_backend)
+
+        def fetch():
+            return self._request(context, limit=limit, offset=offset,
+                                 decode=decode)
+
+        if self._single_flight is None or context.bulk:
+            page, payload_bytes = fetch()
+        else:
+            key = (context.method, context.end_point, context.format_,
+                   tuple(sorted((k, str(v)) for k, v in context.extra_params.items())),
+                   limit, offset)
+            page, payload_bytes = self._single_flight.do(key, fetch,
+                                                         clone=copy.deepcopy)
+        if projection is not None:
+            page = projection.extract_page(page, data_dict_key)
+        return page, payload_bytes
+
+    def _count_records(self, end_point=None, extra_params=None,
+                       data_dict_key=None, deadline=None) -> int:
+        """Return the total number of records for a query.
+
+        A single page with ``limit=0`` is requested, so Alma returns only the
+        count, and nothing is validated. Endpoints which ignore ``limit`` and
+        report a null total (*e.g.* e-services) are counted from the records
+        returned.
+        """
+        if deadline is None:
+            deadline = self.deadline
+        context = RequestContext.create(end_point, 'json', extra_params,
+                                        deadline=deadline)
+        page, _ = self._fetch_page(context, limit=0, offset=0)
+        total_records = page.get('total_record_count')
+        if total_records is None:
+            return len(page.get(data_dict_key) or [])
+        return total_records
+
+    def _resolve_page_size(self, page_size=None):
+        """Return the page size for a call, falling back to the client's."""
+        if page_size is None:
+            return self.page_size
+        return check_page_size(page_size)
+
+    def _page_sizer(self, page_size):
+        """Return an adaptive page sizer capped at page_size, if enabled."""
+        if self.adaptive_page_size:
+            return AdaptivePageSize(min_size=min(MIN_PAGE_SIZE, page_size),
+                                    max_size=page_size)
+
+    @staticmethod
+    def _merge_page(response_json, subsequent_page, data_dict_key):
+        """Append the records of a subsequent page to the first page."""
+        response_json[data_dict_key] += subsequent_page[data_dict_key]
+
+    def _iter_pages(self, end_point=None, format_='json', page_size=None,
+                    extra_params=None, data_dict_key=None, offset=0,
+                    deadline=None, projection=None):
+        """Yield ``(offset, records, total_record_count)`` for each page.
+
+        Pages are requested one at a time starting at ``offset``, so only the
+        page currently being consumed is held in memory. An optional
+        ``deadline`` in seconds bounds the requests of every page, and an
+        optional ``projection`` trims each record to the projected fields.
+        """
+        context = RequestContext.create(end_point, format_, extra_params,
+                                        bulk=True, deadline=deadline)
+
+        page_size = self._resolve_page_size(page_size)
+        page_sizer = self._page_sizer(page_size)
+        while True:
+            limit = page_size
+            started = time.monotonic()
+            page, payload_bytes = self._fetch_page(context, limit=limit,
+                                                   offset=offset,
+                                                   projection=projection,
+                                                   data_dict_key=data_dict_key)
+            if page_sizer:
+                page_size = page_sizer.observe(time.monotonic() - started,
+                                               payload_bytes)
+            # Some endpoints (e.g. e-services) can report a null total.
+            total_records = page.get('total_record_count')
+            records = page.get(data_dict_key) or []
+            del page
+            if not records:
+                return
+            yield offset, records, total_records
+            offset += len(records)
+            if total_records is None:
+                if len(records) < limit:
+                    return
+            elif offset >= total_records:
+                return
+
+    @staticmethod
+    def _projection(model, fields=None):
+        """Return the projection of model onto fields, if any are given."""
+        if fields is None:
+            return None
+        return get_projection(model, fields)
+
+    def _build_model(self, model, record):
+        """Validate a decoded record, or construct it in trusted mode."""
+        if self.trusted_parser is not None:
+            return self.trusted_parser.parse(model, record)
+        if self.lazy_validation:
+            return lazy_model(model).parse_obj(record)
+        return model.parse_obj(record)
+
+    def _parse_record(self, model, result, raw=None):
+        """Validate a single-record result, unless raw output is requested."""
+        if self.raw if raw is None else raw:
+            return result
+        return self._build_model(model, result)
+
+    def _parse_collection(self, collection_model, record_model, result,
+                          data_dict_key, raw=None, projection=None):
+        """Validate a merged multi-page result into its collection model.
+
+        When ``validation_processes`` is set and the result spans more than
+        one page, the records are validated page by page in the process pool
+        and the collection is built from the returned models. With raw
+        output, the merged dict is returned as is; in trusted or lazy mode,
+        the records are built in the calling thread and the collection
+        around them is constructed without validation. The same applies to
+        projected records, which are validated with the projected model.
+        """
+        if self.raw if raw is None else raw:
+            return result
+        records = result.get(data_dict_key) or []
+        if projection is not None:
+            record_model = projection.model
+        if (self.trusted_parser is not None or self.lazy_validation
+                or projection is not None):
+            models = [self._build_model(record_model, record)
+                      for record in records]
+            return construct_model(collection_model,
+                                   {**result, data_dict_key: models})
+        executor = self._validation_executor()
+        if executor and len(records) > self.page_size:
+            chunks = [records[i:i + self.page_size]
+                      for i in range(0, len(records), self.page_size)]
+            models = []
+            for page_models in executor.map(validate_records,
+                                            [record_model] * len(chunks),
+                                            chunks):
+                models += page_models
+            result = {**result, data_dict_key: models}
+        return collection_model.parse_obj(result)
+
+    def _iter_models(self, model, raw=None, fields=None, **kwargs):
+        """Yield validated models for a query one page at a time.
+
+        When ``validation_processes`` is set, each page is sent to the process
+        pool as soon as it arrives while the next page is fetched. At most
+        ``validation_processes`` pages are awaiting validation at once. With
+        raw output, the decoded records are yielded as is. With ``fields``,
+        records are projected and validated with the projected model in the
+        calling thread.
+        """
+        projection = self._projection(model, fields)
+        pages = self._iter_pages(projection=projection, **kwargs)
+        if self.raw if raw is None else raw:
+            for _, records, _ in pages:
+                yield from records
+            return
+        executor = self._validation_executor()
+        if projection is not None:
+            model = projection.model
+            executor = None
+        if executor is None:
+            for _, records, _ in pages:
+                for record in records:
+                    yield self._build_model(model, record)
+            return
+
+        pending = deque()
+        for _, records, _ in pages:
+            pending.append(executor.submit(validate_records, model, records))
+            if len(pending) >= self.validation_processes:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def _get_many(self, getter, ids, concurrency=None):
+        """Call a single-record getter for each distinct ID concurrently.
+
+        Tuple IDs are unpacked into positional arguments. A failure for one
+        ID is recorded in the result instead of aborting the batch.
+        """
+        if concurrency is None:
+            concurrency = self.concurrency
+        unique_ids = list(dict.fromkeys(ids))
+        records = {}
+        errors = {}
+
+        def fetch(id_):
+            try:
+                args = id_ if isinstance(id_, tuple) else (id_,)
+                record = getter(*args)
+                if record is None:
+                    raise LookupError(f"No record found for {id_!r}")
+                return record, None
+            except Exception as e:
+                return None, e
+
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            for id_, (record, error) in zip(unique_ids,
+                                            executor.map(fetch, unique_ids)):
+                if error is None:
+                    records[id_] = record
+                else:
+                    errors[id_] = error
+        return BatchResult(records=records, errors=errors)
+
+    def harvest_records(self, end_point: str, data_dict_key: str,
+                        output_path: str, checkpoint_path: Optional[str] = None,
+                        format_: str = 'json', extra_params={},
+                        page_size: Optional[int] = None) -> int:
+        r"""Harvest all records for a query to a file, resuming if interrupted.
+
+        Records are written to ``output_path`` as JSON Lines, one raw record
+        per line. After each page is written, the endpoint, query, next
+        offset and number of records written are saved to
+        ``checkpoint_path``. If the harvest fails part way through, calling
+        this method again with the same arguments truncates any partially
+        written page and continues from the last completed offset. The
+        checkpoint file is removed once the harvest completes.
+
+        A new harvest (one without a checkpoint) will not overwrite an
+        existing, non-empty ``output_path``.
+
+        Resuming relies on Alma returning the records of a query in a stable
+        order between runs.
+
+        :param end_point: The API endpoint, *e.g.* ``acq/po-lines``.
+        :param data_dict_key: The key holding the records in each page, *e.g.* ``po_line``.
+        :param output_path: Location of the JSON Lines output file.
+        :param checkpoint_path: Location of the checkpoint file (defaults to ``output_path`` + ``.checkpoint``).
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :returns: The total number of records in the output file.
+        :raises FileExistsError: If ``output_path`` already holds data but
+            there is no checkpoint to resume from.
+        :raises ValueError: If ``output_path`` is shorter than its checkpoint
+            records, *e.g.* because it was deleted or replaced.
+        """
+        if checkpoint_path is None:
+            checkpoint_path = f"{output_path}.checkpoint"
+        checkpoint = HarvestCheckpoint.load(checkpoint_path)
+        if checkpoint and not checkpoint.matches(end_point, extra_params, output_path):
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to a "
+                             f"different harvest ({checkpoint.end_point})")
+        if checkpoint is None:
+            if os.path.exists(output_path) and os.path.getsize(output_path):
+                raise FileExistsError(f"{output_path} already exists and there "
+                                      f"is no checkpoint to resume from")
+            checkpoint = HarvestCheckpoint(path=checkpoint_path,
+                                           end_point=end_point,
+                                           extra_params=dict(extra_params),
+                                           output_path=output_path)
+            # Saved before anything is written, so that a harvest which
+            # fails on its first page can still be resumed.
+            checkpoint.save()
+        else:
+            output_bytes = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+            if output_bytes < checkpoint.output_bytes:
+                raise ValueError(f"{output_path} holds {output_bytes} bytes but "
+                                 f"checkpoint {checkpoint_path} expects at least "
+                                 f"{checkpoint.output_bytes}")
+            logging.info(f"Resuming harvest of {end_point} at offset "
+                         f"{checkpoint.next_offset}")
+
+        dumps = self.json_backend.dumps
+        with open(output_path, 'ab') as output_file:
+            output_file.truncate(checkpoint.output_bytes)
+            pages = self._iter_pages(end_point=end_point, format_=format_,
+                                     page_size=page_size,
+                                     extra_params=extra_params,
+                                     data_dict_key=data_dict_key,
+                                     offset=checkpoint.next_offset)
+            for offset, records, total_records in pages:
+                for record in records:
+                    output_file.write(dumps(record) + b'\n')
+                output_file.flush()
+                os.fsync(output_file.fileno())
+                checkpoint.next_offset = offset + len(records)
+                checkpoint.records_written += len(records)
+                checkpoint.output_bytes = output_file.tell()
+                checkpoint.total_record_count = total_records
+                checkpoint.save()
+
+        checkpoint.remove()
+        return checkpoint.records_written
 
     # API methods
 
     # acquisitions
 
-    def get_fund(self, id_: str, format_: str = 'json') -> acquisitions_models.Fund:
+    def get_fund(self, id_: str, format_: str = 'json',
+                 raw: Optional[bool] = None) -> acquisitions_models.Fund:
         r"""Get a fund record.
 
         :param id\_: Alma fund ID.
         :param format\_: Format of the raw returned data.
+        :param raw: Whether to return the decoded dict instead of a validated model (defaults to the client's ``raw``).
 
         The ``extra_params`` dict can include:
 
@@ -127,38 +835,106 @@ class AlmaApiClient(object):
                                    extra_params=extra_params
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.Fund.parse_raw(result)
+            return self._parse_record(acquisitions_models.Fund, result, raw)
+
+    def get_funds_by_ids(self, ids: Iterable[str],
+                         concurrency: Optional[int] = None) -> BatchResult:
+        r"""Get fund records for a list of fund IDs concurrently.
+
+        :param ids: Alma fund IDs; duplicates are fetched once.
+        :param concurrency: Maximum number of parallel requests (defaults to the client's ``concurrency``).
+        :returns: A :class:`BatchResult` keyed by fund ID.
+        """
+        return self._get_many(self.get_fund, ids, concurrency)
 
     def get_funds(self, format_: str = 'json', limit: int = 5,
-                  all_records: bool = False, extra_params={}) -> acquisitions_models.Funds:
+                  all_records: bool = False, extra_params={},
+                  page_size: Optional[int] = None,
+                  deadline: Optional[float] = None,
+                  raw: Optional[bool] = None,
+                  fields: Optional[Iterable[str]] = None) -> acquisitions_models.Funds:
         r"""Get fund records.
 
         :param format\_: Format of the raw returned data.
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
 
         The ``extra_params`` dict can include:
 
         view
           brief|full
         """
-        extra_params['view'] = 'full'
+        extra_params = {**extra_params, 'view': 'full'}
+        projection = self._projection(acquisitions_models.Fund, fields)
         result = self._get_records(end_point='acq/funds',
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='fund'
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.Funds.parse_raw(result)
+            return self._parse_collection(acquisitions_models.Funds,
+                                          acquisitions_models.Fund,
+                                          result, 'fund', raw, projection)
+
+    def iter_funds(self, format_: str = 'json',
+                   extra_params={},
+                   page_size: Optional[int] = None,
+                   raw: Optional[bool] = None,
+                   fields: Optional[Iterable[str]] = None) -> Iterator[acquisitions_models.Fund]:
+        r"""Iterate over fund records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+
+        The ``extra_params`` dict can include:
+
+        view
+          brief|full
+        """
+        end_point = 'acq/funds'
+        yield from self._iter_models(acquisitions_models.Fund,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params={**extra_params, 'view': 'full'},
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='fund'
+                                     )
+
+    def count_funds(self, extra_params={},
+                    deadline: Optional[float] = None) -> int:
+        """Count fund records without retrieving them.
+
+        :param extra_params: Additional parameters, as for :meth:`get_funds`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point='acq/funds',
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='fund'
+                                   )
 
     def get_fund_transactions(self, fund_id: str, format_: str = 'json',
                               limit: int = 5, all_records: bool = False,
-                              extra_params={}) -> acquisitions_models.FundTransactions:
+                              extra_params={},
+                              page_size: Optional[int] = None,
+                              deadline: Optional[float] = None,
+                              raw: Optional[bool] = None,
+                              fields: Optional[Iterable[str]] = None) -> acquisitions_models.FundTransactions:
         r"""Get fund transaction records.
 
         :param fund_id: Alma fund ID.
@@ -166,24 +942,74 @@ class AlmaApiClient(object):
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
         """
         end_point = f"acq/funds/{fund_id}/transactions"
+        projection = self._projection(acquisitions_models.FundTransaction, fields)
         result = self._get_records(end_point=end_point,
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='fund_transaction'
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.FundTransactions.parse_raw(result)
+            return self._parse_collection(acquisitions_models.FundTransactions,
+                                          acquisitions_models.FundTransaction,
+                                          result, 'fund_transaction', raw, projection)
+
+    def iter_fund_transactions(self, fund_id: str, format_: str = 'json',
+                               extra_params={},
+                               page_size: Optional[int] = None,
+                               raw: Optional[bool] = None,
+                               fields: Optional[Iterable[str]] = None) -> Iterator[acquisitions_models.FundTransaction]:
+        r"""Iterate over fund transaction records page by page.
+
+        :param fund_id: Alma fund ID.
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+        """
+        end_point = f"acq/funds/{fund_id}/transactions"
+        yield from self._iter_models(acquisitions_models.FundTransaction,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params=extra_params,
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='fund_transaction'
+                                     )
+
+    def count_fund_transactions(self, fund_id: str, extra_params={},
+                                deadline: Optional[float] = None) -> int:
+        """Count fund transaction records without retrieving them.
+
+        :param fund_id: Alma fund ID.
+        :param extra_params: Additional parameters, as for :meth:`get_fund_transactions`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point=f"acq/funds/{fund_id}/transactions",
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='fund_transaction'
+                                   )
 
-    def get_invoice(self, invoice_id: str, format_: str = 'json') -> acquisitions_models.Invoice:
+    def get_invoice(self, invoice_id: str, format_: str = 'json',
+                    raw: Optional[bool] = None) -> acquisitions_models.Invoice:
         r"""Get an invoice record.
 
         :param invoice_id: Alma invoice ID.
         :param format\_: Format of the raw returned data.
+        :param raw: Whether to return the decoded dict instead of a validated model (defaults to the client's ``raw``).
 
         The ``extra_params`` dict can include:
 
@@ -200,17 +1026,34 @@ class AlmaApiClient(object):
                                    extra_params={}
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.Invoice.parse_raw(result)
+            return self._parse_record(acquisitions_models.Invoice, result, raw)
+
+    def get_invoices_by_ids(self, ids: Iterable[str],
+                            concurrency: Optional[int] = None) -> BatchResult:
+        r"""Get invoice records for a list of invoice IDs concurrently.
+
+        :param ids: Alma invoice IDs; duplicates are fetched once.
+        :param concurrency: Maximum number of parallel requests (defaults to the client's ``concurrency``).
+        :returns: A :class:`BatchResult` keyed by invoice ID.
+        """
+        return self._get_many(self.get_invoice, ids, concurrency)
 
     def get_invoices(self, format_: str = 'json', limit: int = 5,
-                     all_records: bool = False, extra_params={}) -> acquisitions_models.Invoices:
+                     all_records: bool = False, extra_params={},
+                     page_size: Optional[int] = None,
+                     deadline: Optional[float] = None,
+                     raw: Optional[bool] = None,
+                     fields: Optional[Iterable[str]] = None) -> acquisitions_models.Invoices:
         r"""Get invoice records.
 
         :param format\_: Format of the raw returned data.
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
 
         The ``extra_params`` dict can include:
 
@@ -228,24 +1071,83 @@ class AlmaApiClient(object):
           brief|full
         """
         end_point = 'acq/invoices/'
+        projection = self._projection(acquisitions_models.Invoice, fields)
         result = self._get_records(end_point=end_point,
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='invoice'
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.Invoices.parse_raw(result)
+            return self._parse_collection(acquisitions_models.Invoices,
+                                          acquisitions_models.Invoice,
+                                          result, 'invoice', raw, projection)
+
+    def iter_invoices(self, format_: str = 'json',
+                      extra_params={},
+                      page_size: Optional[int] = None,
+                      raw: Optional[bool] = None,
+                      fields: Optional[Iterable[str]] = None) -> Iterator[acquisitions_models.Invoice]:
+        r"""Iterate over invoice records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+
+        The ``extra_params`` dict can include:
+
+        base_status
+          ACTIVE|All|CLOSED
+        creation_form
+          (various)
+        expand
+          attachments|none
+        invoice_workflow_status
+          (various)
+        owner
+          (invoice owner: can be the institution code or a library code)
+        view
+          brief|full
+        """
+        end_point = 'acq/invoices/'
+        yield from self._iter_models(acquisitions_models.Invoice,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params=extra_params,
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='invoice'
+                                     )
+
+    def count_invoices(self, extra_params={},
+                       deadline: Optional[float] = None) -> int:
+        """Count invoice records without retrieving them.
+
+        :param extra_params: Additional parameters, as for :meth:`get_invoices`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point='acq/invoices/',
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='invoice'
+                                   )
 
     def get_invoice_line(self, invoice_id: str, invoice_line_id: str,
-                         format_: str = 'json') -> acquisitions_models.InvoiceLine:
+                         format_: str = 'json',
+                         raw: Optional[bool] = None) -> acquisitions_models.InvoiceLine:
         r"""Get an invoice line record.
 
         :param invoice_id: Alma invoice ID.
         :param invoice_line_id: Alma invoice line ID.
         :param format\_: Format of the raw returned data.
+        :param raw: Whether to return the decoded dict instead of a validated model (defaults to the client's ``raw``).
         """
         end_point = f"acq/invoices/{invoice_id}/lines/{invoice_line_id}"
         result = self._get_records(end_point=end_point,
@@ -255,12 +1157,25 @@ class AlmaApiClient(object):
                                    extra_params={}
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.InvoiceLine.parse_raw(result)
+            return self._parse_record(acquisitions_models.InvoiceLine, result, raw)
+
+    def get_invoice_lines_by_ids(self, ids: Iterable[Tuple[str, str]],
+                                 concurrency: Optional[int] = None) -> BatchResult:
+        r"""Get invoice line records for a list of invoice and invoice line IDs concurrently.
+
+        :param ids: ``(invoice_id, invoice_line_id)`` pairs; duplicates are fetched once.
+        :param concurrency: Maximum number of parallel requests (defaults to the client's ``concurrency``).
+        :returns: A :class:`BatchResult` keyed by ``(invoice_id, invoice_line_id)`` pair.
+        """
+        return self._get_many(self.get_invoice_line, ids, concurrency)
 
     def get_invoice_lines(self, invoice_id: str, format_: str = 'json',
                           limit: int = 5, all_records: bool = False,
-                          extra_params={}) -> acquisitions_models.InvoiceLines:
+                          extra_params={},
+                          page_size: Optional[int] = None,
+                          deadline: Optional[float] = None,
+                          raw: Optional[bool] = None,
+                          fields: Optional[Iterable[str]] = None) -> acquisitions_models.InvoiceLines:
         r"""Get invoice line records.
 
         :param invoice_id: Alma invoice ID.
@@ -268,24 +1183,74 @@ class AlmaApiClient(object):
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
         """
         end_point = f"acq/invoices/{invoice_id}/lines"
+        projection = self._projection(acquisitions_models.InvoiceLine, fields)
         result = self._get_records(end_point=end_point,
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='invoice_line'
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.InvoiceLines.parse_raw(result)
+            return self._parse_collection(acquisitions_models.InvoiceLines,
+                                          acquisitions_models.InvoiceLine,
+                                          result, 'invoice_line', raw, projection)
+
+    def iter_invoice_lines(self, invoice_id: str, format_: str = 'json',
+                           extra_params={},
+                           page_size: Optional[int] = None,
+                           raw: Optional[bool] = None,
+                           fields: Optional[Iterable[str]] = None) -> Iterator[acquisitions_models.InvoiceLine]:
+        r"""Iterate over invoice line records page by page.
+
+        :param invoice_id: Alma invoice ID.
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+        """
+        end_point = f"acq/invoices/{invoice_id}/lines"
+        yield from self._iter_models(acquisitions_models.InvoiceLine,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params=extra_params,
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='invoice_line'
+                                     )
+
+    def count_invoice_lines(self, invoice_id: str, extra_params={},
+                            deadline: Optional[float] = None) -> int:
+        """Count invoice line records without retrieving them.
+
+        :param invoice_id: Alma invoice ID.
+        :param extra_params: Additional parameters, as for :meth:`get_invoice_lines`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point=f"acq/invoices/{invoice_id}/lines",
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='invoice_line'
+                                   )
 
-    def get_license(self, code: str, format_: str = 'json') -> acquisitions_models.License:
+    def get_license(self, code: str, format_: str = 'json',
+                    raw: Optional[bool] = None) -> acquisitions_models.License:
         r"""Get a license record.
 
         :param code: Alma license code.
         :param format\_: Format of the raw returned data.
+        :param raw: Whether to return the decoded dict instead of a validated model (defaults to the client's ``raw``).
 
         The ``extra_params`` dict can include:
 
@@ -302,36 +1267,97 @@ class AlmaApiClient(object):
                                    extra_params={}
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.License.parse_raw(result)
+            return self._parse_record(acquisitions_models.License, result, raw)
+
+    def get_licenses_by_code(self, codes: Iterable[str],
+                             concurrency: Optional[int] = None) -> BatchResult:
+        r"""Get license records for a list of license codes concurrently.
+
+        :param codes: Alma license codes; duplicates are fetched once.
+        :param concurrency: Maximum number of parallel requests (defaults to the client's ``concurrency``).
+        :returns: A :class:`BatchResult` keyed by license code.
+        """
+        return self._get_many(self.get_license, codes, concurrency)
 
     def get_licenses(self, format_: str = 'json', limit: int = 5,
-                     all_records: bool = False, extra_params={}) -> acquisitions_models.Licenses:
+                     all_records: bool = False, extra_params={},
+                     page_size: Optional[int] = None,
+                     deadline: Optional[float] = None,
+                     raw: Optional[bool] = None,
+                     fields: Optional[Iterable[str]] = None) -> acquisitions_models.Licenses:
         r"""Get license records.
 
         :param format\_: Format of the raw returned data.
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
         """
         # extra_params['expand'] = 'attachments'
         end_point = 'acq/licenses'
+        projection = self._projection(acquisitions_models.License, fields)
         result = self._get_records(end_point=end_point,
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='license'
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.Licenses.parse_raw(result)
+            return self._parse_collection(acquisitions_models.Licenses,
+                                          acquisitions_models.License,
+                                          result, 'license', raw, projection)
+
+    def iter_licenses(self, format_: str = 'json',
+                      extra_params={},
+                      page_size: Optional[int] = None,
+                      raw: Optional[bool] = None,
+                      fields: Optional[Iterable[str]] = None) -> Iterator[acquisitions_models.License]:
+        r"""Iterate over license records page by page.
 
-    def get_po_line(self, number: str, format_: str = 'json') -> acquisitions_models.PoLine:
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+        """
+        end_point = 'acq/licenses'
+        yield from self._iter_models(acquisitions_models.License,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params=extra_params,
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='license'
+                                     )
+
+    def count_licenses(self, extra_params={},
+                       deadline: Optional[float] = None) -> int:
+        """Count license records without retrieving them.
+
+        :param extra_params: Additional parameters, as for :meth:`get_licenses`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point='acq/licenses',
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='license'
+                                   )
+
+    def get_po_line(self, number: str, format_: str = 'json',
+                    raw: Optional[bool] = None) -> acquisitions_models.PoLine:
         r"""Get a PO Line record.
 
         :param number: Alma PO Line number.
         :param format\_: Format of the raw returned data.
+        :param raw: Whether to return the decoded dict instead of a validated model (defaults to the client's ``raw``).
         """
         end_point = f"acq/po-lines/{number}"
         # extra_params['expand'] = 'notes'
@@ -343,17 +1369,34 @@ class AlmaApiClient(object):
                                    extra_params={},
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.PoLine.parse_raw(result)
+            return self._parse_record(acquisitions_models.PoLine, result, raw)
+
+    def get_po_lines_by_number(self, numbers: Iterable[str],
+                               concurrency: Optional[int] = None) -> BatchResult:
+        r"""Get PO Line records for a list of PO Line numbers concurrently.
+
+        :param numbers: Alma PO Line numbers; duplicates are fetched once.
+        :param concurrency: Maximum number of parallel requests (defaults to the client's ``concurrency``).
+        :returns: A :class:`BatchResult` keyed by PO Line number.
+        """
+        return self._get_many(self.get_po_line, numbers, concurrency)
 
     def get_po_lines(self, format_: str = 'json', limit: int = 5,
-                     all_records: bool = False, extra_params={}) -> acquisitions_models.PoLines:
+                     all_records: bool = False, extra_params={},
+                     page_size: Optional[int] = None,
+                     deadline: Optional[float] = None,
+                     raw: Optional[bool] = None,
+                     fields: Optional[Iterable[str]] = None) -> acquisitions_models.PoLines:
         r"""Get PO Line records.
 
         :param format\_: Format of the raw returned data.
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
 
         The ``extra_params`` dict can include:
 
@@ -367,25 +1410,104 @@ class AlmaApiClient(object):
           *e.g.:* number~123456, po_number~PO123, title~spenser
         """
         end_point = 'acq/po-lines'
+        projection = self._projection(acquisitions_models.PoLine, fields)
         result = self._get_records(end_point=end_point,
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='po_line'
                                    )
         if result:
-            logging.debug(result)
-            return acquisitions_models.PoLines.parse_raw(result)
+            return self._parse_collection(acquisitions_models.PoLines,
+                                          acquisitions_models.PoLine,
+                                          result, 'po_line', raw, projection)
+
+    def iter_po_lines(self, format_: str = 'json',
+                      extra_params={},
+                      page_size: Optional[int] = None,
+                      raw: Optional[bool] = None,
+                      fields: Optional[Iterable[str]] = None) -> Iterator[acquisitions_models.PoLine]:
+        r"""Iterate over PO Line records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+
+        The ``extra_params`` dict can include:
+
+        acquisition_method
+          PURCHASE|ALL
+        expand
+          locations|notes|locations, notes
+        status
+          ACTIVE|ALL|ALL_WITH_CLOSED|CANCELLED|CLOSED
+        q
+          *e.g.:* number~123456, po_number~PO123, title~spenser
+        """
+        end_point = 'acq/po-lines'
+        yield from self._iter_models(acquisitions_models.PoLine,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params=extra_params,
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='po_line'
+                                     )
+
+    def count_po_lines(self, extra_params={},
+                       deadline: Optional[float] = None) -> int:
+        """Count PO line records without retrieving them.
+
+        :param extra_params: Additional parameters, as for :meth:`get_po_lines`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point='acq/po-lines',
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='po_line'
+                                   )
+
+    def harvest_po_lines(self, output_path: str,
+                         checkpoint_path: Optional[str] = None,
+                         format_: str = 'json', extra_params={},
+                         page_size: Optional[int] = None) -> int:
+        r"""Harvest all PO Line records to a JSON Lines file, resuming if interrupted.
+
+        See :meth:`harvest_records` for how progress is checkpointed.
+
+        :param output_path: Location of the JSON Lines output file.
+        :param checkpoint_path: Location of the checkpoint file (defaults to ``output_path`` + ``.checkpoint``).
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :returns: The total number of records in the output file.
+        """
+        return self.harvest_records(end_point='acq/po-lines',
+                                    data_dict_key='po_line',
+                                    output_path=output_path,
+                                    checkpoint_path=checkpoint_path,
+                                    format_=format_,
+                                    extra_params=extra_params,
+                                    page_size=page_size
+                                    )
 
     # e-resources
 
     def get_electronic_collection(self, collection_id: str,
-                                  format_: str = 'json') -> electronic_resources_models.ElectronicCollection:
+                                  format_: str = 'json',
+                                  raw: Optional[bool] = None) -> electronic_resources_models.ElectronicCollection:
         r"""Get an Electronic Collection record.
 
         :param collection_id: Alma electronic collection ID.
         :param format\_: Format of the raw returned data.
+        :param raw: Whether to return the decoded dict instead of a validated model (defaults to the client's ``raw``).
         """
         result = self._get_records(end_point=f"electronic/e-collections/{collection_id}",
                                    format_=format_,
@@ -394,36 +1516,97 @@ class AlmaApiClient(object):
                                    extra_params={}
                                    )
         if result:
-            logging.debug(result)
-            return electronic_resources_models.ElectronicCollection.parse_raw(result)
+            return self._parse_record(electronic_resources_models.ElectronicCollection, result, raw)
+
+    def get_electronic_collections_by_ids(self, ids: Iterable[str],
+                                          concurrency: Optional[int] = None) -> BatchResult:
+        r"""Get Electronic Collection records for a list of collection IDs concurrently.
+
+        :param ids: Alma electronic collection IDs; duplicates are fetched once.
+        :param concurrency: Maximum number of parallel requests (defaults to the client's ``concurrency``).
+        :returns: A :class:`BatchResult` keyed by collection ID.
+        """
+        return self._get_many(self.get_electronic_collection, ids, concurrency)
 
     def get_electronic_collections(self, format_: str = 'json', limit: int = 5,
-                                   all_records: bool = False, extra_params={}) -> electronic_resources_models.ElectronicCollections:
+                                   all_records: bool = False, extra_params={},
+                                   page_size: Optional[int] = None,
+                                   deadline: Optional[float] = None,
+                                   raw: Optional[bool] = None,
+                                   fields: Optional[Iterable[str]] = None) -> electronic_resources_models.ElectronicCollections:
         r"""Get Electronic Collection records.
 
         :param format\_: Format of the raw returned data.
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
         """
+        projection = self._projection(electronic_resources_models.ElectronicCollection, fields)
         result = self._get_records(end_point='electronic/e-collections',
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='electronic_collection'
                                    )
         if result:
-            logging.debug(result)
-            return electronic_resources_models.ElectronicCollections.parse_raw(result)
+            return self._parse_collection(electronic_resources_models.ElectronicCollections,
+                                          electronic_resources_models.ElectronicCollection,
+                                          result, 'electronic_collection', raw, projection)
+
+    def iter_electronic_collections(self, format_: str = 'json',
+                                    extra_params={},
+                                    page_size: Optional[int] = None,
+                                    raw: Optional[bool] = None,
+                                    fields: Optional[Iterable[str]] = None) -> Iterator[electronic_resources_models.ElectronicCollection]:
+        r"""Iterate over Electronic Collection records page by page.
+
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+        """
+        end_point = 'electronic/e-collections'
+        yield from self._iter_models(electronic_resources_models.ElectronicCollection,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params=extra_params,
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='electronic_collection'
+                                     )
+
+    def count_electronic_collections(self, extra_params={},
+                                     deadline: Optional[float] = None) -> int:
+        """Count Electronic Collection records without retrieving them.
+
+        :param extra_params: Additional parameters, as for :meth:`get_electronic_collections`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point='electronic/e-collections',
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='electronic_collection'
+                                   )
 
     def get_electronic_service(self, collection_id: str, service_id: str,
-                               format_: str = 'json') -> electronic_resources_models.ElectronicService:
+                               format_: str = 'json',
+                               raw: Optional[bool] = None) -> electronic_resources_models.ElectronicService:
         r"""Get an Electronic Service record.
 
         :param collection_id: Alma electronic collection ID.
         :param service_id: Alma electronic service ID.
         :param format\_: Format of the raw returned data.
+        :param raw: Whether to return the decoded dict instead of a validated model (defaults to the client's ``raw``).
         """
         end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}"
         result = self._get_records(end_point=end_point,
@@ -433,12 +1616,15 @@ class AlmaApiClient(object):
                                    extra_params={}
                                    )
         if result:
-            logging.debug(result)
-            return electronic_resources_models.ElectronicService.parse_raw(result)
+            return self._parse_record(electronic_resources_models.ElectronicService, result, raw)
 
     def get_electronic_services(self, collection_id: str,
                                 format_: str = 'json', limit: int = 5,
-                                all_records: bool = False, extra_params={}) -> electronic_resources_models.ElectronicServices:
+                                all_records: bool = False, extra_params={},
+                                page_size: Optional[int] = None,
+                                deadline: Optional[float] = None,
+                                raw: Optional[bool] = None,
+                                fields: Optional[Iterable[str]] = None) -> electronic_resources_models.ElectronicServices:
         r"""Get Electronic Service records.
 
         :param collection_id: Alma electronic collection ID.
@@ -446,27 +1632,77 @@ class AlmaApiClient(object):
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
         """
         end_point = f"electronic/e-collections/{collection_id}/e-services"
+        projection = self._projection(electronic_resources_models.ElectronicService, fields)
         result = self._get_records(end_point=end_point,
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='electronic_service'
                                    )
         if result:
-            logging.debug(result)
-            return electronic_resources_models.ElectronicServices.parse_raw(result)
+            return self._parse_collection(electronic_resources_models.ElectronicServices,
+                                          electronic_resources_models.ElectronicService,
+                                          result, 'electronic_service', raw, projection)
+
+    def iter_electronic_services(self, collection_id: str, format_: str = 'json',
+                                 extra_params={},
+                                 page_size: Optional[int] = None,
+                                 raw: Optional[bool] = None,
+                                 fields: Optional[Iterable[str]] = None) -> Iterator[electronic_resources_models.ElectronicService]:
+        r"""Iterate over Electronic Service records page by page.
+
+        :param collection_id: Alma electronic collection ID.
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services"
+        yield from self._iter_models(electronic_resources_models.ElectronicService,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params=extra_params,
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='electronic_service'
+                                     )
+
+    def count_electronic_services(self, collection_id: str, extra_params={},
+                                  deadline: Optional[float] = None) -> int:
+        """Count Electronic Service records without retrieving them.
+
+        :param collection_id: Alma electronic collection ID.
+        :param extra_params: Additional parameters, as for :meth:`get_electronic_services`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point=f"electronic/e-collections/{collection_id}/e-services",
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='electronic_service'
+                                   )
 
     def get_portfolio(self, collection_id: str, service_id: str,
-                      portfolio_id: str, format_: str = 'json') -> electronic_resources_models.Portfolio:
+                      portfolio_id: str, format_: str = 'json',
+                      raw: Optional[bool] = None) -> electronic_resources_models.Portfolio:
         r"""Get a Portfolio record.
 
         :param collection_id: Alma electronic collection ID.
         :param service_id: Alma electronic service ID.
         :param portfolio_id: Alma portfolio ID.
         :param format\_: Format of the raw returned data.
+        :param raw: Whether to return the decoded dict instead of a validated model (defaults to the client's ``raw``).
         """
         end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}/portfolios/{portfolio_id}"
         result = self._get_records(end_point=end_point,
@@ -476,12 +1712,15 @@ class AlmaApiClient(object):
                                    extra_params={}
                                    )
         if result:
-            logging.debug(result)
-            return electronic_resources_models.Portfolio.parse_raw(result)
+            return self._parse_record(electronic_resources_models.Portfolio, result, raw)
 
     def get_portfolios(self, collection_id: str, service_id: str,
                        format_: str = 'json', limit: int = 5,
-                       all_records: bool = False, extra_params={}) -> electronic_resources_models.Portfolios:
+                       all_records: bool = False, extra_params={},
+                       page_size: Optional[int] = None,
+                       deadline: Optional[float] = None,
+                       raw: Optional[bool] = None,
+                       fields: Optional[Iterable[str]] = None) -> electronic_resources_models.Portfolios:
         r"""Get Portfolio records.
 
         :param collection_id: Alma electronic collection ID.
@@ -490,15 +1729,154 @@ class AlmaApiClient(object):
         :param limit: The maximum number of records to be returned.
         :param all_records: Whether or not all matching records should be returned (overrides ``limit``).
         :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param deadline: Overall time budget in seconds for all pages of the call (defaults to the client's ``deadline``).
+        :param raw: Whether to return the decoded response dict instead of a validated model (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
         """
         end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}/portfolios"
+        projection = self._projection(electronic_resources_models.Portfolio, fields)
         result = self._get_records(end_point=end_point,
                                    format_=format_,
                                    limit=limit,
                                    all_records=all_records,
                                    extra_params=extra_params,
+                                   page_size=page_size,
+                                   deadline=deadline,
+                                   projection=projection,
                                    data_dict_key='portfolio'
                                    )
         if result:
-            logging.debug(result)
-            return electronic_resources_models.Portfolios.parse_raw(result)
+            return self._parse_collection(electronic_resources_models.Portfolios,
+                                          electronic_resources_models.Portfolio,
+                                          result, 'portfolio', raw, projection)
+
+    def iter_portfolios(self, collection_id: str, service_id: str,
+                        format_: str = 'json',
+                        extra_params={},
+                        page_size: Optional[int] = None,
+                        raw: Optional[bool] = None,
+                        fields: Optional[Iterable[str]] = None) -> Iterator[electronic_resources_models.Portfolio]:
+        r"""Iterate over Portfolio records page by page.
+
+        :param collection_id: Alma electronic collection ID.
+        :param service_id: Alma electronic service ID.
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :param raw: Whether to return the decoded dicts instead of validated models (defaults to the client's ``raw``).
+        :param fields: Only extract and validate these fields, given as attribute names, with dotted paths for nested fields; records are then instances of a projected model.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}/portfolios"
+        yield from self._iter_models(electronic_resources_models.Portfolio,
+                                     end_point=end_point,
+                                     format_=format_,
+                                     extra_params=extra_params,
+                                     page_size=page_size,
+                                     raw=raw,
+                                     fields=fields,
+                                     data_dict_key='portfolio'
+                                     )
+
+    def count_portfolios(self, collection_id: str, service_id: str, extra_params={},
+                         deadline: Optional[float] = None) -> int:
+        """Count Portfolio records without retrieving them.
+
+        :param collection_id: Alma electronic collection ID.
+        :param service_id: Alma electronic service ID.
+        :param extra_params: Additional parameters, as for :meth:`get_portfolios`.
+        :param deadline: Time budget in seconds for the call (defaults to the client's ``deadline``).
+        """
+        return self._count_records(end_point=f"electronic/e-collections/{collection_id}/e-services/{service_id}/portfolios",
+                                   extra_params=extra_params,
+                                   deadline=deadline,
+                                   data_dict_key='portfolio'
+                                   )
+
+    def harvest_portfolios(self, collection_id: str, service_id: str,
+                           output_path: str,
+                           checkpoint_path: Optional[str] = None,
+                           format_: str = 'json', extra_params={},
+                           page_size: Optional[int] = None) -> int:
+        r"""Harvest all Portfolio records to a JSON Lines file, resuming if interrupted.
+
+        See :meth:`harvest_records` for how progress is checkpointed.
+
+        :param collection_id: Alma electronic collection ID.
+        :param service_id: Alma electronic service ID.
+        :param output_path: Location of the JSON Lines output file.
+        :param checkpoint_path: Location of the checkpoint file (defaults to ``output_path`` + ``.checkpoint``).
+        :param format\_: Format of the raw returned data.
+        :param extra_params: Additional parameters.
+        :param page_size: Number of records requested per page (defaults to the client's ``page_size``).
+        :returns: The total number of records in the output file.
+        """
+        end_point = f"electronic/e-collections/{collection_id}/e-services/{service_id}/portfolios"
+        return self.harvest_records(end_point=end_point,
+                                    data_dict_key='portfolio',
+                                    output_path=output_path,
+                                    checkpoint_path=checkpoint_path,
+                                    format_=format_,
+                                    extra_params=extra_params,
+                                    page_size=page_size
+                                    )
+
+    def walk_electronic_resources(self,
+                                  collection_filter: Optional[Callable] = None,
+                                  service_filter: Optional[Callable] = None,
+                                  concurrency: Optional[int] = None,
+                                  extra_params={}
+                                  ) -> Iterator[Tuple[electronic_resources_models.ElectronicCollection,
+                                                      electronic_resources_models.ElectronicService,
+                                                      electronic_resources_models.Portfolio]]:
+        r"""Walk every Electronic Collection, its Electronic Services and their Portfolios.
+
+        Collections are streamed page by page. The services of up to
+        ``concurrency`` collections, and the portfolios of up to
+        ``concurrency`` services, are fetched in parallel, and results are
+        yielded in collection, service and portfolio order as soon as they
+        are available. Collections and services which report no portfolios
+        are skipped without requesting them. Records are always validated
+        models, regardless of the client's ``raw`` setting.
+
+        :param collection_filter: Called with each collection; return ``False`` to skip its whole branch.
+        :param service_filter: Called with each collection and service; return ``False`` to skip the service.
+        :param concurrency: Maximum number of parallel requests at each level (defaults to the client's ``concurrency``).
+        :param extra_params: Additional parameters for the collections query.
+        :returns: An iterator of ``(collection, service, portfolio)`` tuples.
+        """
+        if concurrency is None:
+            concurrency = self.concurrency
+        concurrency = max(concurrency, 1)
+
+        def wanted_collection(collection):
+            if collection.portfolios.value == 0:
+                return False
+            return collection_filter is None or collection_filter(collection)
+
+        def fetch_services(collection):
+            return list(self.iter_electronic_services(collection.id_, raw=False))
+
+        def fetch_portfolios(branch):
+            collection, service = branch
+            return list(self.iter_portfolios(collection.id_, service.id_,
+                                             raw=False))
+
+        collections = filter(wanted_collection,
+                             self.iter_electronic_collections(extra_params=extra_params,
+                                                              raw=False))
+        with ThreadPoolExecutor(max_workers=concurrency) as services_executor, \
+                ThreadPoolExecutor(max_workers=concurrency) as portfolios_executor:
+            services = _bounded_map(services_executor, fetch_services,
+                                    collections, concurrency)
+            branches = ((collection, service)
+                        for collection, collection_services in services
+                        for service in collection_services
+                        if service.portfolios.value != 0
+                        and (service_filter is None
+                             or service_filter(collection, service)))
+            portfolios = _bounded_map(portfolios_executor, fetch_portfolios,
+                                      branches, concurrency)
+            for (collection, service), service_portfolios in portfolios:
+                for portfolio in service_portfolios:
+                    yield collection, service, portfolio
@@ -0,0 +1,121 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import json
+
+import requests
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class JsonBackend(NamedTuple):
+    """A JSON library used to decode response bodies and encode records.
+
+    ``loads`` accepts ``bytes``; ``dumps`` returns compact UTF-8 ``bytes``.
+    """
+
+    name: str
+    loads: Callable[[bytes], object]
+    dumps: Callable[[object], bytes]
+
+
+def _json_backends():
+    """Return the installed JSON backends, fastest first."""
+    backends = {}
+    if orjson is not None:
+        backends['orjson'] = JsonBackend('orjson', orjson.loads, orjson.dumps)
+    if ujson is not None:
+        backends['ujson'] = JsonBackend(
+            'ujson', ujson.loads,
+            lambda obj: ujson.dumps(obj, ensure_ascii=False).encode('utf-8'))
+    backends['json'] = JsonBackend(
+        'json', json.loads,
+        lambda obj: json.dumps(obj, ensure_ascii=False,
+                               separators=(',', ':')).encode('utf-8'))
+    return backends
+
+
+JSON_BACKENDS = ('orjson', 'ujson', 'json')
+_INSTALLED_BACKENDS = _json_backends()
+
+
+def get_json_backend(name: Optional[str] = None) -> JsonBackend:
+    """Return a JSON backend by name, or the fastest one installed.
+
+    :param name: One of ``orjson``, ``ujson`` or ``json``; None selects the
+        first of these which is installed.
+    :raises ValueError: If the name is not a known backend.
+    :raises ImportError: If the named backend is not installed.
+    """
+    backends = _INSTALLED_BACKENDS
+    if name is None:
+        return next(backends[n] for n in JSON_BACKENDS if n in backends)
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{name}'; "
+                         f"choose from {', '.join(JSON_BACKENDS)}")
+    if name not in backends:
+        raise ImportError(f"The '{name}' JSON backend is not installed; "
+                          f"install it with 'pip install {name}'")
+    return backends[name]
+
+
+def decode_response(response, stream: bool = False,
+                    backend: Optional[JsonBackend] = None) -> Tuple[dict, int]:
+    """Decode a JSON response body, returning the data and its wire size.
+
+    The body is decoded with ``backend`` (by default the fastest installed
+    one). With ``stream``, the response must have been requested with
+    ``stream=True``: the (transparently decompressed) body is fed to an
+    incremental ``ijson`` parser in chunks, so the raw bytes and the decoded
+    text of a large page are never held in memory alongside the result.
+    Errors while reading the body are raised as the ``requests`` exceptions
+    a buffered read would have raised.
+    """
+    if not stream:
+        loads = (backend or get_json_backend()).loads
+        content = response.content
+        return loads(content), len(content)
+    try:
+        response.raw.decode_content = True
+        data = next(ijson.items(response.raw, '', use_float=True))
+        # Drain any trailing whitespace so the connection can be reused.
+        response.raw.read()
+        return data, response.raw.tell()
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ReadTimeout(e, response=response)
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e, response=response)
+    except DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e, response=response)
+    except ijson.IncompleteJSONError as e:
+        # The body ended (or was cut off) before the document was complete.
+        raise requests.exceptions.ChunkedEncodingError(e, response=response)
+    finally:
+        response.close()
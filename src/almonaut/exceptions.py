@@ -21,11 +21,16 @@ def handle_error_response(resp):
         -40166419: NoValidOptionsParameterError,
         -401873: NoFilterWithPolModeError,
     }
-    error = resp.json().get('error', {})
+    try:
+        error = resp.json().get('error', {})
+    except ValueError:
+        # e.g. an HTML error page from a gateway in front of Alma
+        error = {'message': f"HTTP {resp.status_code}"}
     message = error.get('message')
     code = error.get('code', -1)
     data = error.get('data', {})
-    raise codes[code](message=message, code=code, data=data, response=resp)
+    raise codes.get(code, AlmaApiError)(message=message, code=code, data=data,
+                                        response=resp)
 
 
 class AlmaApiError(Exception):
@@ -75,3 +80,21 @@ class NoFilterWithPolModeError(AlmaApiError):
     """Handle an Alma API NoFilterWithPolModeError exception."""
 
     pass
+
+
+class QuotaReserveError(AlmaApiError):
+    """The remaining daily API quota has dropped below the reserve."""
+
+    message = "The remaining Alma API quota is below the configured reserve"
+
+
+class CircuitOpenError(AlmaApiError):
+    """The circuit breaker is open; the request was not sent."""
+
+    message = "The Alma API circuit breaker is open"
+
+
+class DeadlineExceededError(AlmaApiError):
+    """The deadline of a call passed before all of its requests completed."""
+
+    message = "The Alma API call did not complete before its deadline"
@@ -0,0 +1,106 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, Iterable, Mapping, Optional, Union
+
+import threading
+
+from almonaut.exceptions import QuotaReserveError
+from almonaut.quota import REMAINING_HEADER
+
+DEFAULT_FAMILY = 'default'
+
+
+def endpoint_family(end_point: str) -> str:
+    """Return the API area of an endpoint, *e.g.* ``acq`` or ``electronic``."""
+    return end_point.strip('/').split('/', 1)[0]
+
+
+class ApiKeyPool(object):
+    """A pool of Alma API keys, chosen per endpoint family in round-robin.
+
+    Keys are grouped by the first segment of the endpoint they serve
+    (``acq`` for acquisitions, ``electronic`` for electronic resources);
+    keys listed under ``default`` serve any family without keys of its own.
+    The remaining daily budget Alma reports for each key is tracked, and a
+    key is skipped once its budget drops to ``reserve`` or below.
+
+    :param keys: Either a mapping of endpoint family to API keys, or an
+        iterable of API keys to use for every family. A single key may be
+        given as a string.
+    :param reserve: Number of calls to keep back on each key.
+    """
+
+    def __init__(self,
+                 keys: Union[Mapping[str, Iterable[str]], Iterable[str]],
+                 reserve: int = 0):
+        """Init method."""
+        if not isinstance(keys, Mapping):
+            keys = {DEFAULT_FAMILY: keys}
+        self.keys = {family: ([family_keys] if isinstance(family_keys, (str, bytes))
+                              else list(family_keys))
+                     for family, family_keys in keys.items()}
+        if not any(self.keys.values()):
+            raise ValueError("ApiKeyPool needs at least one API key")
+        self.reserve = reserve
+        self._remaining = {}
+        self._next = {family: 0 for family in self.keys}
+        self._lock = threading.Lock()
+
+    def _family_keys(self, family):
+        if self.keys.get(family):
+            return family
+        if self.keys.get(DEFAULT_FAMILY):
+            return DEFAULT_FAMILY
+        raise KeyError(f"No API key configured for '{family}' endpoints")
+
+    def select(self, end_point: str) -> str:
+        """Return the next API key with budget left for an endpoint.
+
+        :raises QuotaReserveError: If every key for the endpoint's family is
+            at or below the reserve.
+        """
+        family = self._family_keys(endpoint_family(end_point))
+        candidates = self.keys[family]
+        with self._lock:
+            start = self._next[family]
+            for i in range(len(candidates)):
+                key = candidates[(start + i) % len(candidates)]
+                remaining = self._remaining.get(key)
+                if remaining is None or remaining > self.reserve:
+                    self._next[family] = (start + i + 1) % len(candidates)
+                    return key
+        raise QuotaReserveError(message=f"Every API key for '{family}' "
+                                        f"endpoints is at its reserve",
+                                data={'family': family, 'reserve': self.reserve})
+
+    def update(self, key: str, response):
+        """Record the remaining budget Alma reported for a key."""
+        value = response.headers.get(REMAINING_HEADER)
+        if value is None:
+            return
+        try:
+            remaining = int(value)
+        except ValueError:
+            return
+        with self._lock:
+            self._remaining[key] = remaining
+
+    def remaining(self, key: Optional[str] = None) -> Union[Optional[int], Dict[str, Optional[int]]]:
+        """Return the last reported budget of a key, or of every key."""
+        with self._lock:
+            if key is not None:
+                return self._remaining.get(key)
+            return {k: self._remaining.get(k)
+                    for family_keys in self.keys.values() for k in family_keys}
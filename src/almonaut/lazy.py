@@ -0,0 +1,169 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Type
+
+import threading
+
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import SHAPE_SINGLETON
+
+_lazy_models = {}
+_lazy_models_lock = threading.Lock()
+
+
+def _is_deferred(field) -> bool:
+    """Whether a field holds a nested model or a list, validated on access."""
+    type_ = field.type_
+    return (field.shape != SHAPE_SINGLETON
+            or (isinstance(type_, type) and issubclass(type_, BaseModel)))
+
+
+class LazyModelMixin(object):
+    """Defer the validation of nested models and lists until first access.
+
+    ``parse_obj`` validates the top-level scalar fields of a record at once
+    and keeps the raw values of its nested models and lists aside. Each of
+    those is validated with its field's own validators the first time it is
+    read, and cached. Serialising, comparing, copying or pickling the model
+    validates any fields which are still pending first.
+
+    Use :func:`lazy_model` to get the lazy variant of a model class.
+    """
+
+    @classmethod
+    def parse_obj(cls, obj):
+        """Validate the scalar fields of a record, deferring the others."""
+        if not isinstance(obj, dict):
+            return super(LazyModelMixin, cls).parse_obj(obj)
+        values = {}
+        pending = {}
+        fields_set = set()
+        errors = []
+        for name, field in cls.__fields__.items():
+            if field.alias in obj:
+                value = obj[field.alias]
+            elif cls.__config__.allow_population_by_field_name and name in obj:
+                value = obj[name]
+            elif field.required:
+                errors.append(ErrorWrapper(MissingError(), loc=field.alias))
+                continue
+            else:
+                values[name] = field.get_default()
+                continue
+            fields_set.add(name)
+            if _is_deferred(field):
+                pending[name] = value
+                continue
+            value, error = field.validate(value, values, loc=field.alias, cls=cls)
+            if error:
+                errors.append(error)
+            else:
+                values[name] = value
+        if errors:
+            raise ValidationError(errors, cls)
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, '__dict__', values)
+        object.__setattr__(instance, '__fields_set__', fields_set)
+        object.__setattr__(instance, '_lazy_pending', pending)
+        instance._init_private_attributes()
+        return instance
+
+    def __getattr__(self, name):
+        """Validate a pending field on first access."""
+        try:
+            pending = object.__getattribute__(self, '_lazy_pending')
+        except AttributeError:
+            pending = {}
+        if name not in pending:
+            raise AttributeError(f"'{type(self).__name__}' object has no "
+                                 f"attribute '{name}'")
+        field = self.__fields__[name]
+        value, error = field.validate(pending[name], self.__dict__,
+                                      loc=field.alias, cls=type(self))
+        if error:
+            raise ValidationError([error], type(self))
+        self.__dict__[name] = value
+        pending.pop(name, None)
+        return value
+
+    def _resolve_pending(self):
+        """Validate every field which is still pending."""
+        pending = getattr(self, '_lazy_pending', None)
+        if pending is None:
+            return
+        for name in list(pending):
+            if name in self.__dict__:
+                # Assigned since parsing; the raw value is stale.
+                pending.pop(name, None)
+            else:
+                getattr(self, name)
+        # Restore the field order of an eagerly validated model.
+        values = self.__dict__
+        ordered = {name: values[name] for name in self.__fields__ if name in values}
+        ordered.update(values)
+        object.__setattr__(self, '__dict__', ordered)
+        object.__setattr__(self, '_lazy_pending', None)
+
+    def _iter(self, *args, **kwargs):
+        self._resolve_pending()
+        return super(LazyModelMixin, self)._iter(*args, **kwargs)
+
+    def __repr_args__(self):
+        self._resolve_pending()
+        return super(LazyModelMixin, self).__repr_args__()
+
+    def __eq__(self, other):
+        self._resolve_pending()
+        if isinstance(other, LazyModelMixin):
+            other._resolve_pending()
+        return super(LazyModelMixin, self).__eq__(other)
+
+    def copy(self, *args, **kwargs):
+        self._resolve_pending()
+        return super(LazyModelMixin, self).copy(*args, **kwargs)
+
+    def __reduce__(self):
+        self._resolve_pending()
+        return _restore_lazy_model, (self._lazy_base, self.__getstate__())
+
+
+def _restore_lazy_model(model, state):
+    """Unpickle a lazy model, whose class is created at runtime."""
+    lazy = lazy_model(model)
+    instance = lazy.__new__(lazy)
+    instance.__setstate__(state)
+    object.__setattr__(instance, '_lazy_pending', None)
+    return instance
+
+
+def lazy_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Return the lazily validated variant of a model class.
+
+    The variant is a subclass of ``model`` (so ``isinstance`` checks still
+    hold) named ``Lazy<Model>``, and is created once per model.
+    """
+    lazy = _lazy_models.get(model)
+    if lazy is None:
+        with _lazy_models_lock:
+            lazy = _lazy_models.get(model)
+            if lazy is None:
+                lazy = type(f"Lazy{model.__name__}", (LazyModelMixin, model),
+                            {'__module__': __name__,
+                             '__slots__': ('_lazy_pending',),
+                             '_lazy_base': model})
+                _lazy_models[model] = lazy
+    return lazy
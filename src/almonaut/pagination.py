@@ -0,0 +1,60 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+MAX_PAGE_SIZE = 100
+MIN_PAGE_SIZE = 10
+
+
+def check_page_size(page_size):
+    """Validate a page size against the limits accepted by the Alma API."""
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}, "
+                         f"got {page_size}")
+    return page_size
+
+
+class AdaptivePageSize(object):
+    """Adjust the page size of a paginated query from observed responses.
+
+    Starts at the maximum page size, which minimises the number of round
+    trips. The page size is halved whenever a page is slower than
+    ``target_latency`` or larger than ``max_payload_bytes``, and doubled
+    again once pages come back comfortably within both budgets.
+
+    :param min_size: The smallest page size to fall back to.
+    :param max_size: The largest page size to request.
+    :param target_latency: Acceptable time in seconds to fetch one page.
+    :param max_payload_bytes: Acceptable size in bytes of one page body.
+    """
+
+    def __init__(self,
+                 min_size: int = MIN_PAGE_SIZE,
+                 max_size: int = MAX_PAGE_SIZE,
+                 target_latency: float = 5.0,
+                 max_payload_bytes: int = 8 * 1024 * 1024):
+        """Init method."""
+        self.min_size = check_page_size(min_size)
+        self.max_size = check_page_size(max_size)
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self.size = self.max_size
+
+    def observe(self, latency: float, payload_bytes: int) -> int:
+        """Record a fetched page and return the page size for the next one."""
+        if latency > self.target_latency or payload_bytes > self.max_payload_bytes:
+            self.size = max(self.min_size, self.size // 2)
+        elif (latency < self.target_latency / 2
+              and payload_bytes < self.max_payload_bytes / 2):
+            self.size = min(self.max_size, self.size * 2)
+        return self.size
@@ -0,0 +1,26 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List, Type
+
+from pydantic import BaseModel
+
+
+def validate_records(model: Type[BaseModel], records: List[dict]) -> List[BaseModel]:
+    """Validate a page of decoded records into models.
+
+    Defined at module level so that it can be sent to a process pool; both
+    the model class and the resulting instances are picklable.
+    """
+    return [model.parse_obj(record) for record in records]
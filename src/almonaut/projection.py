@@ -0,0 +1,150 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Iterable, List, Optional, Tuple, Type
+
+import threading
+
+from pydantic import BaseModel, Field, create_model
+from pydantic.class_validators import VALIDATOR_CONFIG_KEY
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+_projections = {}
+_projections_lock = threading.Lock()
+
+
+def _field_tree(model: Type[BaseModel], paths: Iterable[str]) -> dict:
+    """Group dotted field paths into a tree of field names.
+
+    A leaf (a whole field) is marked with None.
+
+    :raises ValueError: If a path does not name a field of the model.
+    """
+    tree = {}
+    for path in paths:
+        name, _, rest = path.partition('.')
+        field = model.__fields__.get(name)
+        if field is None:
+            raise ValueError(f"{model.__name__} has no field '{name}'")
+        if not rest:
+            tree[name] = None
+            continue
+        type_ = field.type_
+        if (field.shape not in (SHAPE_SINGLETON, SHAPE_LIST)
+                or not (isinstance(type_, type) and issubclass(type_, BaseModel))):
+            raise ValueError(f"{model.__name__}.{name} has no nested fields")
+        if name in tree and tree[name] is None:
+            continue
+        tree.setdefault(name, []).append(rest)
+    return {name: None if rest is None else _field_tree(model.__fields__[name].type_, rest)
+            for name, rest in tree.items()}
+
+
+def _projected_model(model: Type[BaseModel], tree: dict) -> Type[BaseModel]:
+    """Create a model holding only the fields in tree, with their validators."""
+    definitions = {}
+    namespace = {}
+    for name, subtree in tree.items():
+        field = model.__fields__[name]
+        if subtree is None:
+            annotation = field.outer_type_
+        else:
+            annotation = _projected_model(field.type_, subtree)
+            if field.shape == SHAPE_LIST:
+                annotation = List[annotation]
+        if field.allow_none:
+            annotation = Optional[annotation]
+        default = ... if field.required else field.default
+        definitions[name] = (annotation, Field(default, alias=field.alias))
+        for i, validator in enumerate(model.__validators__.get(name, ())):
+            holder = classmethod(validator.func)
+            setattr(holder, VALIDATOR_CONFIG_KEY, ((name,), validator))
+            namespace[f"_validate_{name}_{i}"] = holder
+    return create_model(f"{model.__name__}Projection",
+                        __module__=__name__,
+                        __validators__=namespace,
+                        **definitions)
+
+
+def _extractor(model: Type[BaseModel], tree: dict):
+    """Return (alias, nested extractor, is_list) for each field in tree."""
+    spec = []
+    for name, subtree in tree.items():
+        field = model.__fields__[name]
+        nested = None if subtree is None else _extractor(field.type_, subtree)
+        spec.append((field.alias, nested, field.shape == SHAPE_LIST))
+    return spec
+
+
+def _extract(spec, record: dict) -> dict:
+    projected = {}
+    for alias, nested, is_list in spec:
+        if alias not in record:
+            continue
+        value = record[alias]
+        if nested is not None and value is not None:
+            if is_list:
+                value = [_extract(nested, item) if isinstance(item, dict) else item
+                         for item in value]
+            elif isinstance(value, dict):
+                value = _extract(nested, value)
+        projected[alias] = value
+    return projected
+
+
+class Projection(object):
+    """A subset of the fields of a model, possibly nested.
+
+    ``extract`` copies only the projected values out of a decoded record, so
+    the rest of the record can be released at once, and ``model`` is a
+    pydantic model with just those fields (named ``<Model>Projection``),
+    keeping their aliases, defaults and validators.
+
+    Use :func:`get_projection` to get a cached projection.
+
+    :param model: The model to project.
+    :param fields: Field names, or dotted paths for nested fields (*e.g.*
+        ``amount.sum_`` or ``resource_metadata.title``).
+    """
+
+    def __init__(self, model: Type[BaseModel], fields: Tuple[str, ...]):
+        """Init method."""
+        tree = _field_tree(model, fields)
+        self.fields = fields
+        self.model = _projected_model(model, tree)
+        self._spec = _extractor(model, tree)
+
+    def extract(self, record: dict) -> dict:
+        """Return a new dict holding only the projected values of a record."""
+        return _extract(self._spec, record)
+
+    def extract_page(self, page: dict, data_dict_key: str) -> dict:
+        """Return a copy of a decoded page with its records projected."""
+        records = page.get(data_dict_key)
+        if records is None:
+            return page
+        return {**page, data_dict_key: [self.extract(record) for record in records]}
+
+
+def get_projection(model: Type[BaseModel], fields: Iterable[str]) -> Projection:
+    """Return the projection of a model onto fields, creating it once."""
+    key = (model, tuple(fields))
+    projection = _projections.get(key)
+    if projection is None:
+        with _projections_lock:
+            projection = _projections.get(key)
+            if projection is None:
+                projection = Projection(model, key[1])
+                _projections[key] = projection
+    return projection
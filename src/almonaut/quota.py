@@ -0,0 +1,91 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+import logging
+import threading
+import time
+
+from almonaut.exceptions import QuotaReserveError
+
+REMAINING_HEADER = 'X-Exl-Api-Remaining'
+
+_LAST = object()
+
+
+class ApiQuota(object):
+    """The remaining daily API quota, as last reported by Alma.
+
+    Alma reports the number of API calls remaining for the day in the
+    ``X-Exl-Api-Remaining`` header of each response. Once that number drops
+    below ``reserve``, bulk requests (paginated harvests) are either slowed
+    down by ``delay`` seconds each or, if ``delay`` is None, stopped with a
+    :class:`~almonaut.exceptions.QuotaReserveError`, leaving the rest of the
+    quota to interactive use.
+
+    :param reserve: Number of calls to keep back for interactive use.
+    :param delay: Seconds to wait before each bulk request while below the
+        reserve, or None to raise instead.
+    """
+
+    def __init__(self, reserve: Optional[int] = None,
+                 delay: Optional[float] = 1.0):
+        """Init method."""
+        self.reserve = reserve
+        self.delay = delay
+        self.remaining = None
+        self.updated = None
+        self._lock = threading.Lock()
+
+    def update(self, response):
+        """Record the remaining quota from a response's headers."""
+        value = response.headers.get(REMAINING_HEADER)
+        if value is None:
+            return
+        try:
+            remaining = int(value)
+        except ValueError:
+            return
+        with self._lock:
+            self.remaining = remaining
+            self.updated = time.time()
+
+    def below_reserve(self, remaining=_LAST) -> bool:
+        """Whether the last reported quota is below the reserve.
+
+        :param remaining: The quota to check instead of the last reported
+            one, *e.g.* that of the key a request will use.
+        """
+        if remaining is _LAST:
+            remaining = self.remaining
+        return (self.reserve is not None and remaining is not None
+                and remaining < self.reserve)
+
+    def throttle(self, remaining=_LAST):
+        """Slow down or stop a bulk request while below the reserve.
+
+        :param remaining: The quota to check instead of the last reported
+            one, *e.g.* that of the key a request will use.
+        """
+        if remaining is _LAST:
+            remaining = self.remaining
+        if not self.below_reserve(remaining):
+            return
+        if self.delay is None:
+            raise QuotaReserveError(data={'remaining': remaining,
+                                          'reserve': self.reserve})
+        logging.warning(f"Alma API quota ({remaining}) is below the "
+                        f"reserve ({self.reserve}); slowing down")
+        time.sleep(self.delay)
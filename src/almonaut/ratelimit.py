@@ -0,0 +1,129 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional, Tuple
+
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class TokenBucket(object):
+    """A token-bucket rate limiter shared by the threads of one process.
+
+    The bucket refills at ``rate`` tokens per second up to ``capacity``.
+    Each request takes one token; when the bucket is empty the caller
+    reserves a future token and sleeps until it is due, so concurrent
+    callers are spaced out evenly instead of retrying in a burst.
+
+    :param rate: Sustained number of requests per second.
+    :param capacity: Maximum burst size (defaults to ``rate``).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Init method."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = self._clock()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def _reserve(self, tokens: float, available: float,
+                 updated: float, now: float) -> Tuple[float, float]:
+        """Take tokens from a bucket state, returning (remaining, wait)."""
+        available = min(self.capacity, available + (now - updated) * self.rate)
+        available -= tokens
+        return available, max(0.0, -available / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, sleeping until they are available.
+
+        :returns: The number of seconds spent waiting.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens, wait = self._reserve(tokens, self._tokens,
+                                               self._updated, now)
+            self._updated = now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class FileTokenBucket(TokenBucket):
+    """A token-bucket rate limiter shared by every process on one host.
+
+    The bucket state is kept in a small JSON file guarded by an exclusive
+    ``flock``, so separate harvest scripts pointing at the same ``path``
+    share one request budget. Requires a POSIX platform.
+
+    :param path: Location of the shared bucket state file.
+    :param rate: Sustained number of requests per second, for all processes.
+    :param capacity: Maximum burst size (defaults to ``rate``).
+    """
+
+    def __init__(self, path: str, rate: float, capacity: Optional[float] = None):
+        """Init method."""
+        if fcntl is None:
+            raise OSError("FileTokenBucket requires fcntl (POSIX only)")
+        super(FileTokenBucket, self).__init__(rate, capacity)
+        self.path = path
+
+    @staticmethod
+    def _clock() -> float:
+        # Wall-clock time, since monotonic clocks are not comparable
+        # between processes.
+        return time.time()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens from the shared bucket, sleeping until available.
+
+        :returns: The number of seconds spent waiting.
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            with self._lock:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    with os.fdopen(os.dup(fd), 'r+', encoding='utf-8') as state_file:
+                        try:
+                            state = json.load(state_file)
+                            available, updated = state['tokens'], state['updated']
+                        except (ValueError, KeyError):
+                            available, updated = self.capacity, self._clock()
+                        now = self._clock()
+                        available, wait = self._reserve(tokens, available,
+                                                        updated, now)
+                        state_file.seek(0)
+                        state_file.truncate()
+                        json.dump({'tokens': available, 'updated': now}, state_file)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,105 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import random
+
+
+class RetryPolicy(object):
+    """When and how long to wait before retrying a failed API request.
+
+    Only idempotent methods are retried. A request is retried after a
+    connection error, a timeout or a response with one of the
+    ``status_forcelist`` codes. The wait before attempt *n* is drawn
+    uniformly from ``[0, min(backoff_max, backoff_factor * 2 ** n)]``
+    ("full jitter"), unless the response carries a ``Retry-After`` header,
+    which is then honoured instead. A request is never retried sooner than
+    its ``Retry-After``; if that is longer than ``backoff_max``, it is not
+    retried at all.
+
+    :param total: Maximum number of retries after the first attempt.
+    :param backoff_factor: Base delay in seconds of the exponential backoff.
+    :param backoff_max: Upper bound in seconds of a single backoff delay.
+    :param status_forcelist: HTTP status codes which should be retried.
+    :param allowed_methods: HTTP methods which are safe to retry.
+    :param respect_retry_after: Whether to honour ``Retry-After`` headers.
+    :param max_elapsed: Overall time budget in seconds across all attempts
+        of one request; no retry is scheduled past it.
+    """
+
+    def __init__(self,
+                 total: int = 3,
+                 backoff_factor: float = 0.5,
+                 backoff_max: float = 30.0,
+                 status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+                 allowed_methods: Iterable[str] = ('GET', 'HEAD', 'OPTIONS'),
+                 respect_retry_after: bool = True,
+                 max_elapsed: Optional[float] = None):
+        """Init method."""
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.status_forcelist = frozenset(status_forcelist)
+        self.allowed_methods = frozenset(m.upper() for m in allowed_methods)
+        self.respect_retry_after = respect_retry_after
+        self.max_elapsed = max_elapsed
+
+    def is_retryable(self, method: str, attempt: int, response=None) -> bool:
+        """Whether a failed attempt (0-based) may be retried.
+
+        :param method: The HTTP method of the request.
+        :param attempt: The number of retries already made.
+        :param response: The error response, or None after a connection
+            error or timeout.
+        """
+        if attempt >= self.total or method.upper() not in self.allowed_methods:
+            return False
+        return response is None or response.status_code in self.status_forcelist
+
+    def backoff(self, attempt: int, response=None) -> Optional[float]:
+        """Return the delay in seconds before the next attempt.
+
+        :returns: The delay, or None if the response's ``Retry-After`` is
+            longer than ``backoff_max`` and the request should not be retried.
+        """
+        if response is not None and self.respect_retry_after:
+            retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.backoff_max else None
+        return random.uniform(0, min(self.backoff_max,
+                                     self.backoff_factor * 2 ** attempt))
+
+    def within_budget(self, elapsed: float, delay: float) -> bool:
+        """Whether waiting delay seconds stays within max_elapsed."""
+        return self.max_elapsed is None or elapsed + delay <= self.max_elapsed
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -12,17 +12,78 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import socket
+
 import requests
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+DEFAULT_HEADERS = {
+    'Accept-Charset': 'utf-8',
+    'Content-Type': 'text/plain',
+}
+
+
+def keepalive_socket_options():
+    """Return socket options enabling TCP keep-alive probes on idle connections."""
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # Probe after 60s idle, every 15s, and give up after 4 failed probes;
+    # the constants are platform-specific, so only set those available.
+    for name, value in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 15),
+                        ('TCP_KEEPCNT', 4)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """An HTTP adapter which can enable TCP keep-alive on pooled connections.
+
+    :param tcp_keepalive: Whether to enable TCP keep-alive probes, so that
+        idle pooled connections (and their TLS sessions) are kept open by
+        middleboxes and dead ones are detected.
+    """
+
+    def __init__(self, *args, tcp_keepalive: bool = True, **kwargs):
+        """Init method."""
+        # Set before HTTPAdapter.__init__, which calls init_poolmanager.
+        self.tcp_keepalive = tcp_keepalive
+        super(KeepAliveHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager, adding the keep-alive socket options."""
+        if self.tcp_keepalive:
+            kwargs['socket_options'] = (HTTPConnection.default_socket_options
+                                        + keepalive_socket_options())
+        super(KeepAliveHTTPAdapter, self).init_poolmanager(*args, **kwargs)
 
 
 class AlmaApiSession(requests.Session):
-    """The persistent TCP session."""
+    """The persistent TCP session.
+
+    :param pool_connections: Number of per-host connection pools to cache.
+    :param pool_maxsize: Maximum number of connections kept open per host;
+        should be at least the number of threads sharing the session.
+    :param pool_block: Whether a thread should wait for a free connection
+        when the pool is exhausted, rather than opening a throwaway one.
+    :param tcp_keepalive: Whether to enable TCP keep-alive on connections.
+    """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args,
+                 pool_connections: int = DEFAULT_POOLSIZE,
+                 pool_maxsize: int = DEFAULT_POOLSIZE,
+                 pool_block: bool = DEFAULT_POOLBLOCK,
+                 tcp_keepalive: bool = True,
+                 **kwargs):
         """Init method."""
         super(AlmaApiSession, self).__init__(*args, **kwargs)
 
-        self.headers.update({
-            'Accept-Charset': 'utf-8',
-            'Content-Type': 'text/plain',
-        })
+        # requests already accepts gzip and deflate, plus br when brotli is
+        # installed (see the ``compression`` extra); urllib3 decodes them.
+        self.headers.update(DEFAULT_HEADERS)
+        adapter = KeepAliveHTTPAdapter(pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize,
+                                       pool_block=pool_block,
+                                       tcp_keepalive=tcp_keepalive)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
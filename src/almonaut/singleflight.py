@@ -0,0 +1,66 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import Future
+from typing import Callable, Hashable, Optional
+
+import threading
+
+
+class SingleFlight(object):
+    """Coalesce concurrent calls which share a key into a single call.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is in flight wait for it and receive the same result,
+    or the same exception. Nothing is cached once the call has completed.
+    """
+
+    def __init__(self):
+        """Init method."""
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def do(self, key: Hashable, fn: Callable, clone: Optional[Callable] = None):
+        """Run fn for key, or wait for the identical call already running.
+
+        :param clone: If given and the call was shared, each caller receives
+            ``clone(result)`` instead of the shared result, so it may modify
+            its copy freely.
+        """
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = [Future(), 0]
+                self._in_flight[key] = flight
+            else:
+                flight[1] += 1
+        future = flight[0]
+        if not leader:
+            result = future.result()
+            return result if clone is None else clone(result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        future.set_result(result)
+        # No more followers can join once the key is removed.
+        if clone is not None and flight[1]:
+            return clone(result)
+        return result
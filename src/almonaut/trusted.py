@@ -0,0 +1,169 @@
+# Copyright 2022 University of Waterloo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import date
+from typing import Type
+
+import logging
+import random
+import threading
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import SHAPE_LIST
+
+_plans = {}
+
+
+def _is_model(type_) -> bool:
+    return isinstance(type_, type) and issubclass(type_, BaseModel)
+
+
+def _converter(type_):
+    """Return the cheap conversion applied to a trusted field value."""
+    if _is_model(type_):
+        def convert(value):
+            return construct_model(type_, value) if isinstance(value, dict) else value
+        return convert
+    if type_ is date:
+        def convert(value):
+            return date.fromisoformat(value) if isinstance(value, str) else value
+        return convert
+    if type_ in (int, float):
+        # Alma sends amounts such as ``sum`` as JSON strings.
+        def convert(value):
+            return value if type(value) is type_ else type_(value)
+        return convert
+    return None
+
+
+_MISSING = object()
+_IMMUTABLE_DEFAULTS = (type(None), bool, int, float, str, bytes, tuple, frozenset)
+
+
+def _plan(model: Type[BaseModel]):
+    """Return (and cache) how to build each field of a model.
+
+    The plan maps each alias (and field name) to what is needed to build
+    that field, and holds a template of the model's defaults in field order,
+    with a marker for required fields.
+    """
+    plan = _plans.get(model)
+    if plan is None:
+        by_key = {}
+        template = {}
+        required = []
+        factories = []
+        for name, field in model.__fields__.items():
+            entry = (name, field, tuple(field.pre_validators or ()),
+                     field.shape == SHAPE_LIST, _converter(field.type_))
+            by_key[name] = entry
+            by_key[field.alias] = entry
+            if field.required:
+                template[name] = _MISSING
+                required.append(name)
+            elif (field.default_factory is None
+                  and isinstance(field.default, _IMMUTABLE_DEFAULTS)):
+                template[name] = field.default
+            else:
+                template[name] = None
+                factories.append((name, field))
+        plan = by_key, template, frozenset(required), factories
+        _plans[model] = plan
+    return plan
+
+
+def construct_model(model: Type[BaseModel], data: dict) -> BaseModel:
+    """Build a model and its nested models from trusted data, unvalidated.
+
+    Values are only renamed from their aliases, run through the model's
+    ``pre`` validators (*e.g.* stripping the ``Z`` from Alma dates, or
+    turning an empty ``sum`` into None), and nested dicts, ISO dates and
+    numbers are converted; no other type checking or coercion takes place.
+    Like ``construct()``, required fields missing from ``data`` are left
+    unset.
+    """
+    by_key, template, required, factories = _plan(model)
+    values = dict(template)
+    fields_set = set()
+    config = model.__config__
+    for key, value in data.items():
+        entry = by_key.get(key)
+        if entry is None:
+            continue
+        name, field, pre_validators, is_list, convert = entry
+        for pre_validator in pre_validators:
+            value = pre_validator(model, value, values, field, config)
+        if convert is not None and value is not None:
+            if is_list:
+                value = [convert(item) for item in value]
+            else:
+                value = convert(value)
+        values[name] = value
+        fields_set.add(name)
+    if not fields_set.issuperset(required):
+        for name in required - fields_set:
+            del values[name]
+    for name, field in factories:
+        if name not in fields_set:
+            values[name] = field.get_default()
+    instance = model.__new__(model)
+    object.__setattr__(instance, '__dict__', values)
+    object.__setattr__(instance, '__fields_set__', fields_set)
+    instance._init_private_attributes()
+    return instance
+
+
+class TrustedParser(object):
+    """Build models with :func:`construct_model`, validating a sample.
+
+    A ``sample_rate`` fraction of records is also fully validated with
+    ``parse_obj``. A sampled record which fails validation, or whose
+    validated model differs from the constructed one, means Alma's payload
+    no longer matches the models: it is logged as a warning and counted in
+    ``drift_count``. The constructed model is returned either way, and a
+    record which cannot be constructed at all is fully validated instead.
+
+    :param sample_rate: Fraction of records to fully validate (0 to 1).
+    """
+
+    def __init__(self, sample_rate: float = 0.01):
+        """Init method."""
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.drift_count = 0
+        self._lock = threading.Lock()
+
+    def _report_drift(self, model, reason):
+        with self._lock:
+            self.drift_count += 1
+        logging.warning(f"Schema drift in {model.__name__}: {reason}")
+
+    def parse(self, model: Type[BaseModel], data: dict) -> BaseModel:
+        """Build a model from a decoded record."""
+        try:
+            constructed = construct_model(model, data)
+        except (TypeError, ValueError, AttributeError, IndexError) as e:
+            self._report_drift(model, f"cannot be constructed ({e!r})")
+            return model.parse_obj(data)
+        if self.sample_rate and random.random() < self.sample_rate:
+            try:
+                validated = model.parse_obj(data)
+            except ValidationError as e:
+                self._report_drift(model, str(e).replace('\n', ' '))
+            else:
+                if validated != constructed:
+                    self._report_drift(model, "constructed and validated "
+                                              "records differ")
+        return constructed
@@ -0,0 +1,86 @@
+import pytest
+import requests
+
+from almonaut.circuitbreaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from almonaut.client import AlmaApiClient
+from almonaut.exceptions import CircuitOpenError
+
+
+class FakeResponse(object):
+    status_code = 200
+    headers = {}
+    url = ''
+    content = b'{"total_record_count": 0}'
+
+    def close(self):
+        pass
+
+
+class FakeSession(object):
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+
+    def request(self, *args, **kwargs):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    def close(self):
+        pass
+
+
+def open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def client_with(breaker, *outcomes):
+    client = AlmaApiClient('key', retry_policy=None, circuit_breaker=breaker)
+    client.session = FakeSession(*outcomes)
+    return client
+
+
+def test_breaker_opens_and_rejects():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    client = client_with(breaker, requests.ConnectionError(), requests.ConnectionError())
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            client.get_funds()
+    with pytest.raises(CircuitOpenError):
+        client.get_funds()
+
+
+@pytest.mark.parametrize('error', [requests.exceptions.ChunkedEncodingError(),
+                                   requests.exceptions.TooManyRedirects()])
+def test_failed_probe_with_other_request_error_reopens(error):
+    breaker = open_breaker()
+    client = client_with(breaker, error, FakeResponse())
+    with pytest.raises(type(error)):
+        client.get_funds()
+    assert breaker.state == OPEN
+    # The next probe is admitted and closes the breaker.
+    client.get_funds()
+    assert breaker.state == CLOSED
+
+
+def test_interrupted_probe_releases_its_slot():
+    breaker = open_breaker()
+    client = client_with(breaker, KeyboardInterrupt(), FakeResponse())
+    with pytest.raises(KeyboardInterrupt):
+        client.get_funds()
+    assert breaker.state == HALF_OPEN
+    client.get_funds()
+    assert breaker.state == CLOSED
+
+
+def test_timeout_cut_short_by_deadline_is_not_a_failure():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    client = client_with(breaker, requests.Timeout(), FakeResponse())
+    with pytest.raises(requests.Timeout):
+        client.get_funds(deadline=5)
+    assert breaker.state == CLOSED
+    client.get_funds()
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+import requests
+
+from almonaut.client import AlmaApiClient
+
+
+class FakeResponse(object):
+    status_code = 200
+    headers = {}
+    url = ''
+
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+
+    def close(self):
+        pass
+
+
+class PagedSession(object):
+    """Serve total po_line records, failing the request numbered fail_at."""
+
+    def __init__(self, total, fail_at=None):
+        self.total = total
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def request(self, method, url, params, **kwargs):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise requests.ConnectionError('connection reset')
+        offset, limit = params['offset'], params['limit']
+        records = [{'i': i} for i in range(offset, min(offset + limit, self.total))]
+        return FakeResponse({'po_line': records, 'total_record_count': self.total})
+
+    def close(self):
+        pass
+
+
+def interrupted_harvest(tmp_path):
+    client = AlmaApiClient('key', retry_policy=None, page_size=10)
+    client.session = PagedSession(total=35, fail_at=3)
+    output_path = tmp_path / 'po_lines.jsonl'
+    with pytest.raises(requests.ConnectionError):
+        client.harvest_po_lines(str(output_path))
+    return client, output_path
+
+
+def test_resume_from_checkpoint(tmp_path):
+    client, output_path = interrupted_harvest(tmp_path)
+    # A page which was partly written before the failure is discarded.
+    with open(output_path, 'ab') as output_file:
+        output_file.write(b'{"i": 2')
+    client.session = PagedSession(total=35)
+    assert client.harvest_po_lines(str(output_path)) == 35
+    records = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert records == [{'i': i} for i in range(35)]
+    assert not (tmp_path / 'po_lines.jsonl.checkpoint').exists()
+
+
+def test_resume_refuses_truncated_output(tmp_path):
+    client, output_path = interrupted_harvest(tmp_path)
+    output_path.unlink()
+    client.session = PagedSession(total=35)
+    with pytest.raises(ValueError):
+        client.harvest_po_lines(str(output_path))
+    assert not output_path.exists()
+
+
+def test_new_harvest_refuses_existing_output(tmp_path):
+    output_path = tmp_path / 'po_lines.jsonl'
+    output_path.write_bytes(b'{"i": 0}\n')
+    client = AlmaApiClient('key', retry_policy=None, page_size=10)
+    client.session = PagedSession(total=35)
+    with pytest.raises(FileExistsError):
+        client.harvest_po_lines(str(output_path))
+    assert output_path.read_bytes() == b'{"i": 0}\n'